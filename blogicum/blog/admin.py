@@ -1,8 +1,162 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.contrib.admin.helpers import ACTION_CHECKBOX_NAME
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.contenttypes.models import ContentType
+from django.template.response import TemplateResponse
 
+from . import moderation
 from .models import Category, Comment, Location, Post
+from .paginators import ApproximateCountPaginator
 
-admin.site.register(Category)
-admin.site.register(Location)
-admin.site.register(Post)
-admin.site.register(Comment)
+CONFIRMATION_SAMPLE = 20
+LOG_BATCH_SIZE = 1000
+
+
+def confirm_batch_delete(modeladmin, request, queryset, action):
+    """Страница подтверждения пакетного удаления.
+
+    В отличие от ``delete_selected`` объекты и связанные с ними строки
+    не перечисляются целиком: выводятся их число и первые записи.
+    """
+    opts = modeladmin.model._meta
+    select_across = request.POST.get('select_across') == '1'
+    return TemplateResponse(
+        request,
+        'admin/blog/batch_delete_confirmation.html',
+        {
+            **modeladmin.admin_site.each_context(request),
+            'title': 'Подтверждение пакетного удаления',
+            'opts': opts,
+            'action': action,
+            'count': queryset.count(),
+            'sample': queryset[:CONFIRMATION_SAMPLE],
+            'select_across': select_across,
+            'selected': (
+                [] if select_across
+                else request.POST.getlist(ACTION_CHECKBOX_NAME)
+            ),
+            'action_checkbox_name': ACTION_CHECKBOX_NAME,
+        },
+    )
+
+
+def log_batch_deletion(request, queryset, describe, *fields):
+    """Записывает удаление в журнал админки по строке на объект.
+
+    Записи создаются пачками через ``bulk_create`` до удаления, так как
+    потом строк уже нет; ``describe`` строит представление объекта из
+    значений ``fields``.
+    """
+    content_type_id = ContentType.objects.get_for_model(queryset.model).pk
+    rows = queryset.order_by().values_list('pk', *fields).iterator(
+        chunk_size=LOG_BATCH_SIZE
+    )
+    entries = (
+        LogEntry(
+            user_id=request.user.pk,
+            content_type_id=content_type_id,
+            object_id=str(pk),
+            object_repr=describe(*values)[:200],
+            action_flag=DELETION,
+        )
+        for pk, *values in rows
+    )
+    LogEntry.objects.bulk_create(entries, batch_size=LOG_BATCH_SIZE)
+
+
+@admin.register(Category)
+class CategoryAdmin(admin.ModelAdmin):
+    list_display = ('title', 'slug', 'is_published', 'created_at')
+    list_editable = ('is_published',)
+    list_filter = ('is_published',)
+    search_fields = ('title', 'slug')
+    prepopulated_fields = {'slug': ('title',)}
+
+
+@admin.register(Location)
+class LocationAdmin(admin.ModelAdmin):
+    list_display = ('name', 'is_published', 'created_at')
+    list_editable = ('is_published',)
+    list_filter = ('is_published',)
+    search_fields = ('name',)
+
+
+@admin.register(Post)
+class PostAdmin(admin.ModelAdmin):
+    list_display = (
+        'title', 'author', 'category', 'location', 'pub_date', 'is_published'
+    )
+    list_editable = ('is_published',)
+    list_select_related = ('author', 'category', 'location')
+    list_filter = ('is_published', 'category', 'pub_date')
+    search_fields = ('title',)
+    raw_id_fields = ('author',)
+    autocomplete_fields = ('category', 'location')
+    date_hierarchy = 'pub_date'
+    show_full_result_count = False
+    paginator = ApproximateCountPaginator
+    actions = ('publish_posts', 'unpublish_posts', 'delete_posts')
+
+    @admin.action(
+        description='Опубликовать выбранные публикации',
+        permissions=('change',)
+    )
+    def publish_posts(self, request, queryset):
+        count = moderation.set_published(queryset, True)
+        self.message_user(request, f'Опубликовано публикаций: {count}.')
+
+    @admin.action(
+        description='Снять с публикации выбранные публикации',
+        permissions=('change',)
+    )
+    def unpublish_posts(self, request, queryset):
+        count = moderation.set_published(queryset, False)
+        self.message_user(
+            request, f'Снято с публикации публикаций: {count}.'
+        )
+
+    @admin.action(
+        description='Удалить выбранные публикации пакетно',
+        permissions=('delete',)
+    )
+    def delete_posts(self, request, queryset):
+        if request.POST.get('post') != 'yes':
+            return confirm_batch_delete(
+                self, request, queryset, 'delete_posts'
+            )
+        log_batch_deletion(request, queryset, str, 'title')
+        count = moderation.delete_posts(queryset)
+        self.message_user(
+            request, f'Удалено публикаций: {count}.', messages.WARNING
+        )
+
+
+@admin.register(Comment)
+class CommentAdmin(admin.ModelAdmin):
+    list_display = ('__str__', 'author', 'post', 'created_at')
+    list_select_related = ('author', 'post')
+    search_fields = ('text',)
+    raw_id_fields = ('author', 'post')
+    date_hierarchy = 'created_at'
+    show_full_result_count = False
+    paginator = ApproximateCountPaginator
+    actions = ('delete_comments',)
+
+    @admin.action(
+        description='Удалить выбранные комментарии пакетно',
+        permissions=('delete',)
+    )
+    def delete_comments(self, request, queryset):
+        if request.POST.get('post') != 'yes':
+            return confirm_batch_delete(
+                self, request, queryset, 'delete_comments'
+            )
+        log_batch_deletion(
+            request, queryset,
+            lambda author, post: f'Комментарий от {author} к "{post}"',
+            'author__username', 'post__title'
+        )
+        count = moderation.delete_comments(queryset)
+        self.message_user(
+            request, f'Удалено комментариев: {count}.', messages.WARNING
+        )
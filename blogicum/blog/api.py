@@ -0,0 +1,234 @@
+"""Read-only JSON API для мобильного клиента.
+
+Ответы строятся из проекций ``values()`` без создания экземпляров
+моделей и отдаются потоково. Списки листаются курсором по
+``(pub_date, id)``, поле ``fields`` позволяет запросить только нужные
+поля, правила видимости совпадают с HTML-страницами.
+"""
+import base64
+import binascii
+import json
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Count, Q
+from django.http import JsonResponse, StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from django.utils.dateparse import parse_datetime
+
+from .models import Category, Comment, Post
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+CHUNK_SIZE = 500
+
+POST_FIELDS = {
+    'id': 'id',
+    'title': 'title',
+    'text': 'text',
+    'pub_date': 'pub_date',
+    'author': 'author__username',
+    'category': 'category__slug',
+    'location': 'location__name',
+    'image': 'image',
+    'comment_count': 'comment_count',
+}
+COMMENT_FIELDS = {
+    'id': 'id',
+    'author': 'author__username',
+    'text': 'text',
+    'created_at': 'created_at',
+}
+
+encoder = DjangoJSONEncoder()
+image_storage = Post._meta.get_field('image').storage
+
+
+class ApiError(Exception):
+    pass
+
+
+def parse_fields(request, available):
+    requested = request.GET.get('fields')
+    if not requested:
+        return list(available)
+    fields = [name.strip() for name in requested.split(',') if name.strip()]
+    unknown = set(fields) - set(available)
+    if unknown:
+        raise ApiError(f'Неизвестные поля: {", ".join(sorted(unknown))}')
+    return fields
+
+
+def parse_limit(request):
+    try:
+        limit = int(request.GET.get('limit', PAGE_SIZE))
+    except ValueError:
+        raise ApiError('Параметр limit должен быть числом.')
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def encode_cursor(pub_date, pk):
+    raw = f'{pub_date.isoformat()}|{pk}'.encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    try:
+        pub_date, pk = (
+            base64.urlsafe_b64decode(cursor.encode()).decode().split('|')
+        )
+        pub_date, pk = parse_datetime(pub_date), int(pk)
+    except (binascii.Error, UnicodeError, ValueError):
+        raise ApiError('Некорректный курсор.')
+    if pub_date is None:
+        raise ApiError('Некорректный курсор.')
+    return pub_date, pk
+
+
+def project_posts(queryset, fields, *extra):
+    """Проекция публикаций в словари с запрошенными полями."""
+    if 'comment_count' in fields:
+        queryset = queryset.annotate(comment_count=Count('comments'))
+    lookups = {POST_FIELDS[name] for name in fields if name != 'location'}
+    if 'location' in fields:
+        lookups |= {'location__name', 'location__is_published'}
+    return queryset.values('pk', *lookups, *extra)
+
+
+def serialize_post(row, fields):
+    item = {}
+    for name in fields:
+        if name == 'location':
+            item[name] = (
+                row['location__name'] if row['location__is_published']
+                else None
+            )
+        elif name == 'image':
+            item[name] = (
+                image_storage.url(row['image']) if row['image'] else None
+            )
+        else:
+            item[name] = row[POST_FIELDS[name]]
+    return item
+
+
+def stream_json(head, items, tail):
+    """Отдаёт JSON-объект частями: голова, элементы списка, хвост.
+
+    ``head`` — начало объекта до открывающей скобки списка включительно,
+    ``tail`` — функция, возвращающая окончание объекта после обхода
+    элементов.
+    """
+    yield head
+    for number, item in enumerate(items):
+        yield (',' if number else '') + encoder.encode(item)
+    yield tail()
+
+
+def post_page_response(request, queryset, extra=None):
+    """Страница публикаций с курсорной пагинацией."""
+    try:
+        fields = parse_fields(request, POST_FIELDS)
+        limit = parse_limit(request)
+        cursor = request.GET.get('cursor')
+        if cursor:
+            pub_date, pk = decode_cursor(cursor)
+            queryset = queryset.filter(
+                Q(pub_date__lt=pub_date) | Q(pub_date=pub_date, pk__lt=pk)
+            )
+    except ApiError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+
+    rows = (
+        project_posts(queryset.order_by(), fields + ['pub_date'])
+        .order_by('-pub_date', '-pk')[:limit + 1]
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    state = {'last': None, 'has_next': False}
+
+    def items():
+        for number, row in enumerate(rows):
+            if number == limit:
+                state['has_next'] = True
+                break
+            state['last'] = row
+            yield serialize_post(row, fields)
+
+    def tail():
+        last = state['last']
+        next_cursor = (
+            encode_cursor(last['pub_date'], last['pk'])
+            if state['has_next'] else None
+        )
+        return f'],"next":{json.dumps(next_cursor)}}}'
+
+    head = '{'
+    if extra is not None:
+        head += ''.join(
+            f'{json.dumps(key)}:{encoder.encode(value)},'
+            for key, value in extra.items()
+        )
+    return StreamingHttpResponse(
+        stream_json(head + '"results":[', items(), tail),
+        content_type='application/json'
+    )
+
+
+def index(request):
+    return post_page_response(request, Post.objects.published())
+
+
+def category_posts(request, category_slug):
+    category = get_object_or_404(
+        Category.objects.values('title', 'slug', 'description'),
+        slug=category_slug,
+        is_published=True
+    )
+    posts = Post.objects.published().filter(category__slug=category_slug)
+    return post_page_response(request, posts, {'category': category})
+
+
+def profile(request, username):
+    author = get_object_or_404(
+        User.objects.values(
+            'pk', 'username', 'first_name', 'last_name', 'date_joined'
+        ),
+        username=username
+    )
+    posts = Post.objects.filter(author_id=author.pop('pk'))
+    if request.user.username != username:
+        posts = posts.published()
+    return post_page_response(request, posts, {'profile': author})
+
+
+def post_detail(request, post_id):
+    try:
+        fields = parse_fields(request, POST_FIELDS)
+    except ApiError as error:
+        return JsonResponse({'error': str(error)}, status=400)
+
+    posts = Post.objects.filter(pk=post_id)
+    row = project_posts(posts, fields, 'author_id').first()
+    if row is None or (
+        request.user.pk != row['author_id']
+        and not posts.published().exists()
+    ):
+        return JsonResponse({'error': 'Публикация не найдена.'}, status=404)
+
+    comments = (
+        Comment.objects.filter(post_id=post_id)
+        .values(*COMMENT_FIELDS.values())
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    items = (
+        {name: comment[lookup] for name, lookup in COMMENT_FIELDS.items()}
+        for comment in comments
+    )
+    head = (
+        '{"post":' + encoder.encode(serialize_post(row, fields))
+        + ',"comments":['
+    )
+    return StreamingHttpResponse(
+        stream_json(head, items, lambda: ']}'),
+        content_type='application/json'
+    )
@@ -1,7 +1,34 @@
 from django.apps import AppConfig
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+LOCAL_CACHE = 'django.core.cache.backends.locmem.LocMemCache'
+CACHE_SESSION_ENGINES = (
+    'django.contrib.sessions.backends.cache',
+    'django.contrib.sessions.backends.cached_db',
+)
+
+
+def check_shared_caches():
+    """Запрещает LocMem для общих кэшей при нескольких процессах."""
+    if settings.BLOG_WORKERS <= 1:
+        return
+    aliases = [settings.BLOG_SHARED_CACHE]
+    if settings.SESSION_ENGINE in CACHE_SESSION_ENGINES:
+        aliases.append(settings.SESSION_CACHE_ALIAS)
+    for alias in aliases:
+        if settings.CACHES[alias]['BACKEND'] == LOCAL_CACHE:
+            raise ImproperlyConfigured(
+                f'Кэш {alias!r} должен быть общим для '
+                f'{settings.BLOG_WORKERS} процессов, а не LocMem.'
+            )
 
 
 class BlogConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'blog'
     verbose_name = 'Блог'
+
+    def ready(self):
+        check_shared_caches()
+        from . import signals  # noqa: F401
@@ -0,0 +1,94 @@
+"""Асинхронные варианты страниц чтения для запуска под ASGI.
+
+Django 3.2 не умеет выполнять запросы ORM в event loop, поэтому данные
+и шаблоны (которые тоже могут обращаться к базе — пользователь из
+сессии, контекст-процессоры) обрабатываются через ``sync_to_async`` в
+общем потоке (thread_sensitive). Событийный цикл при этом не держит
+поток на каждого медленного клиента.
+"""
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.db import connections
+from django.http import Http404
+from django.shortcuts import render
+
+from . import views
+from .forms import CommentForm
+from .models import Comment, Post
+
+render_async = sync_to_async(render, thread_sensitive=True)
+
+
+def in_own_connection(func):
+    """Выполняет запрос в отдельном потоке со своим соединением с базой.
+
+    Такие запросы идут параллельно, а соединение закрывается сразу после
+    выполнения, чтобы не оставлять их открытыми в потоках пула.
+    """
+    def wrapper(*args):
+        try:
+            return func(*args)
+        finally:
+            connections.close_all()
+    return sync_to_async(wrapper, thread_sensitive=False)
+
+
+@in_own_connection
+def load_post(post_id):
+    return (
+        Post.objects.select_related(
+            'author', 'category', 'location', 'rendered'
+        ).filter(pk=post_id).first()
+    )
+
+
+@in_own_connection
+def load_comments(post_id):
+    return list(
+        Comment.objects.filter(post_id=post_id).select_related('author')
+    )
+
+
+@in_own_connection
+def count_comments(post_id):
+    return Comment.objects.filter(post_id=post_id).count()
+
+
+async def index(request):
+    context = await sync_to_async(views.index_context)(request)
+    return await render_async(request, 'blog/index.html', context)
+
+
+async def category_posts(request, category_slug):
+    context = await sync_to_async(views.category_context)(
+        request, category_slug
+    )
+    return await render_async(request, 'blog/category.html', context)
+
+
+async def profile(request, username):
+    context = await sync_to_async(views.profile_context)(request, username)
+    return await render_async(request, 'blog/profile.html', context)
+
+
+async def post_detail(request, post_id):
+    """Пост, комментарии и их число загружаются одновременно."""
+    user_id, (post, comments, comment_count) = await asyncio.gather(
+        sync_to_async(lambda: request.user.pk)(),
+        asyncio.gather(
+            load_post(post_id),
+            load_comments(post_id),
+            count_comments(post_id),
+        ),
+    )
+    if post is None or (
+        user_id != post.author_id and not post.is_visible
+    ):
+        raise Http404
+    return await render_async(request, 'blog/detail.html', {
+        'post': post,
+        'form': CommentForm(),
+        'comments': comments,
+        'comment_count': comment_count,
+    })
@@ -0,0 +1,299 @@
+"""Сценарии нагрузочных замеров для команды ``bench``.
+
+Каждый сценарий выполняется на временной тестовой базе, которая
+создаётся перед замером и удаляется после него, поэтому рабочие данные
+не затрагиваются.
+"""
+import asyncio
+import importlib
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hashers
+from django.contrib.auth.models import User
+from django.core.paginator import Paginator
+from django.db import connection, connections
+from django.template.loader import get_template
+from django.test import AsyncClient, Client, RequestFactory
+from django.test.utils import (CaptureQueriesContext, override_settings,
+                               setup_test_environment,
+                               teardown_test_environment)
+from django.urls import clear_url_caches, reverse
+from django.utils import timezone
+
+from . import feed, stats, timeline
+from .excerpts import make_excerpt
+from .links import build_url
+from .models import AuthorStats, Category, Follow, Location, Post
+from .registry import registry
+from .views import POSTS_PER_PAGE, paginate
+
+SCENARIOS = {}
+
+
+def scenario(func):
+    SCENARIOS[func.__name__] = func
+    return func
+
+
+@contextmanager
+def temporary_database():
+    setup_test_environment(debug=False)
+    connection = connections['default']
+    old_name = connection.creation.create_test_db(
+        verbosity=0, autoclobber=True, serialize=False
+    )
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+def seed_posts(count, authors=10, categories=5, batch_size=1000):
+    """Создаёт опубликованные посты в обход save() и сигналов."""
+    users = [
+        User.objects.create(username=f'author{number}')
+        for number in range(authors)
+    ]
+    category_objects = [
+        Category.objects.create(
+            title=f'Категория {number}', slug=f'category-{number}',
+            description='Описание'
+        )
+        for number in range(categories)
+    ]
+    location = Location.objects.create(name='Планета')
+    now = timezone.now()
+    text = 'Текст публикации. ' * 50
+    excerpt_html = make_excerpt(text)
+    for start in range(0, count, batch_size):
+        Post.objects.bulk_create(
+            Post(
+                title=f'Публикация {number}',
+                text=text,
+                excerpt_html=excerpt_html,
+                pub_date=now - timedelta(minutes=number + 1),
+                author=users[number % authors],
+                category=category_objects[number % categories],
+                location=location,
+                is_visible=True,
+            )
+            for number in range(start, min(start + batch_size, count))
+        )
+    feed.rebuild()
+    return users, category_objects
+
+
+def report(out, label, requests, seconds):
+    out.write(
+        f'{label}: {requests} запросов за {seconds:.2f} с, '
+        f'{requests / seconds:.1f} запросов/с'
+    )
+
+
+@contextmanager
+def read_views(use_async):
+    """Переключает маршруты страниц чтения на (а)синхронные варианты."""
+    from blog import urls as blog_urls
+    from blogicum import urls as root_urls
+
+    def reload():
+        importlib.reload(blog_urls)
+        importlib.reload(root_urls)
+        clear_url_caches()
+
+    try:
+        with override_settings(BLOG_ASYNC_VIEWS=use_async):
+            reload()
+            yield
+    finally:
+        reload()
+
+
+@scenario
+def wsgi_vs_asgi(out, size, requests, concurrency, **options):
+    """Пропускная способность ленты: WSGI-поток на запрос против ASGI."""
+    seed_posts(size)
+    urls = ['/', '/category/category-0/', '/profile/author0/', '/?page=2']
+    targets = [urls[number % len(urls)] for number in range(requests)]
+
+    with read_views(use_async=False):
+        def fetch(url):
+            return Client().get(url).status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            statuses = list(executor.map(fetch, targets))
+        report(out, 'WSGI', requests, time.perf_counter() - started)
+        assert set(statuses) == {200}, statuses
+
+    with read_views(use_async=True):
+        async def run():
+            client = AsyncClient()
+            limit = asyncio.Semaphore(concurrency)
+
+            async def fetch(url):
+                async with limit:
+                    return (await client.get(url)).status_code
+
+            return await asyncio.gather(*(fetch(url) for url in targets))
+
+        started = time.perf_counter()
+        statuses = asyncio.run(run())
+        report(out, 'ASGI', requests, time.perf_counter() - started)
+        assert set(statuses) == {200}, statuses
+
+
+def timed(func, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - started) / repeat
+
+
+@scenario
+def post_card(out, size, requests, **options):
+    """Время построения адресов и рендера одной карточки ленты."""
+    seed_posts(size)
+    repeat = requests * 100
+    out.write(
+        'reverse(): {:.2f} мкс, build_url(): {:.2f} мкс на адрес'.format(
+            timed(lambda: reverse('blog:post_detail', args=[1]), repeat)
+            * 1e6,
+            timed(lambda: build_url('blog:post_detail', 1), repeat) * 1e6,
+        )
+    )
+
+    posts = list(Post.objects.full_chain()[:size])
+    template = get_template('includes/feed_item.html')
+
+    def render_cards():
+        for post in posts:
+            template.render({'post': post})
+
+    per_card = timed(render_cards, requests) / len(posts)
+    out.write(f'Рендер карточки: {per_card * 1e6:.1f} мкс')
+
+
+@scenario
+def login(out, requests, **options):
+    """Число входов в секунду на одно ядро для настроенных хэшеров."""
+    password = 'correct horse battery staple'
+    for hasher in get_hashers():
+        try:
+            encoded = hasher.encode(password, hasher.salt())
+        except ValueError:
+            out.write(f'{hasher.algorithm}: библиотека не установлена')
+            continue
+        seconds = timed(lambda: hasher.verify(password, encoded), requests)
+        out.write(f'{hasher.algorithm}: {1 / seconds:.1f} проверок/с')
+
+    User.objects.create_user('bench', password=password)
+    client = Client()
+    started = time.perf_counter()
+    for _ in range(requests):
+        client.post(
+            reverse('login'), {'username': 'bench', 'password': password}
+        )
+        client.get(reverse('blog:index'))
+    report(
+        out, 'Вход и первая страница', requests,
+        time.perf_counter() - started
+    )
+
+
+@scenario
+def pagination(out, size, requests, **options):
+    """Рендер навигации по страницам: все номера против сокращённых.
+
+    ``size`` — число страниц в ленте; данные в базу не записываются.
+    """
+    request = RequestFactory().get('/', {'page': size // 2})
+    template = get_template('includes/paginator.html')
+    page_obj = paginate(range(size * POSTS_PER_PAGE), request)
+    elided_links = page_obj.page_links
+    full_links = Paginator(
+        range(size * POSTS_PER_PAGE), POSTS_PER_PAGE
+    ).page_range
+
+    for label, links in (('Все страницы', full_links),
+                         ('Сокращённо', elided_links)):
+        page_obj.page_links = links
+        html = template.render({'page_obj': page_obj})
+        seconds = timed(
+            lambda: template.render({'page_obj': page_obj}), requests
+        )
+        out.write(
+            f'{label}: {seconds * 1e3:.2f} мс на рендер, '
+            f'{len(html.encode()) / 1024:.1f} КБ'
+        )
+
+
+@scenario
+def feed_cards(out, size, **options):
+    """Память и запросы на выборку ``size`` карточек ленты.
+
+    Сравниваются полные экземпляры ``full_chain()`` и ``cards()``
+    с загрузкой только выводимых столбцов; карточки рендерятся, чтобы
+    убедиться, что отложенные поля не догружаются отдельными запросами.
+    """
+    seed_posts(size)
+    template = get_template('includes/feed_item.html')
+    querysets = (
+        ('full_chain()', Post.objects.full_chain()),
+        ('cards()', Post.objects.published().cards()),
+    )
+    for label, queryset in querysets:
+        with CaptureQueriesContext(connection) as queries:
+            tracemalloc.start()
+            posts = registry.attach(list(queryset.all()[:size]))
+            current, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            for post in posts:
+                template.render({'post': post})
+        out.write(
+            f'{label}: {current / len(posts):.0f} Б на карточку, '
+            f'пик {peak / 1024:.0f} КБ, запросов {len(queries)}'
+        )
+
+
+@scenario
+def following_feed(out, size, requests, **options):
+    """Задержка ленты подписок читателя, подписанного на 1000 авторов.
+
+    Замеряется доставка всех постов в ленту, смешанный режим (10%
+    авторов популярны и читаются при запросе) и чтение без доставки.
+    """
+    users, _ = seed_posts(size, authors=1000)
+    reader = User.objects.create(username='reader')
+    Follow.objects.bulk_create(
+        Follow(follower=reader, author=author) for author in users
+    )
+    stats.refresh_authors(user.pk for user in users)
+    started = time.perf_counter()
+    timeline.sync(Post.objects.values_list('pk', flat=True))
+    out.write(
+        f'Доставка {size} постов: {time.perf_counter() - started:.2f} с'
+    )
+
+    client = Client()
+    client.force_login(reader)
+    url = reverse('blog:follow_index')
+    popular_share = (('доставка', 0), ('смешанная', 0.1), ('чтение', 1))
+    for label, share in popular_share:
+        AuthorStats.objects.update(followers_count=1)
+        AuthorStats.objects.filter(
+            user_id__in=[user.pk for user in users[:int(len(users) * share)]]
+        ).update(followers_count=settings.BLOG_FANOUT_FOLLOWER_LIMIT + 1)
+        for page in (1, 10):
+            seconds = timed(
+                lambda: client.get(url, {'page': page}), requests
+            )
+            out.write(
+                f'{label}, страница {page}: {seconds * 1e3:.1f} мс'
+            )
@@ -0,0 +1,53 @@
+"""Версионированные ключи кэша для фрагментов страниц.
+
+Версии хранятся в кэше BLOG_SHARED_CACHE, чтобы изменение в одном
+процессе меняло ключи фрагментов во всех остальных.
+"""
+from django.conf import settings
+from django.contrib.auth import HASH_SESSION_KEY, SESSION_KEY
+from django.core.cache import caches
+
+HEADER_VERSION_KEY = 'blog:header-version:{}'
+
+
+def version(key):
+    """Текущая версия из общего кэша."""
+    return caches[settings.BLOG_SHARED_CACHE].get_or_set(key, 1, None)
+
+
+def bump_version(key):
+    """Меняет версию, и ключи со старой версией перестают читаться."""
+    cache = caches[settings.BLOG_SHARED_CACHE]
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 2, None)
+
+
+def header_version(user_id):
+    return version(HEADER_VERSION_KEY.format(user_id))
+
+
+def bump_header_version(user_id):
+    """Инвалидирует закэшированную шапку пользователя."""
+    bump_version(HEADER_VERSION_KEY.format(user_id))
+
+
+def header_cache_key(request):
+    """Ключ фрагмента шапки без загрузки пользователя из базы.
+
+    Пользователь определяется по данным сессии; хэш авторизации в
+    ключе отделяет сессии, ставшие недействительными после смены пароля.
+    """
+    match = request.resolver_match
+    view_name = match.view_name if match else ''
+    session = getattr(request, 'session', {})
+    user_id = session.get(SESSION_KEY)
+    if user_id is None:
+        return f'anonymous:{view_name}'
+    return ':'.join((
+        str(user_id),
+        str(header_version(user_id)),
+        session.get(HASH_SESSION_KEY, ''),
+        view_name,
+    ))
@@ -0,0 +1,95 @@
+"""Объединение одновременных комментариев к одной публикации.
+
+Первый запрос к публикации становится ведущим: он ждёт
+BLOG_COMMENT_COALESCE_WINDOW миллисекунд, собирая комментарии, пришедшие
+за это время из других потоков, и записывает их одной транзакцией —
+с одной проверкой публикации и одним пересчётом статистики. Остальные
+запросы ждут результата ведущего и получают его же ответ.
+
+При ненулевом окне каждый комментарий ждёт до конца окна своей пачки:
+ведущий — всё окно целиком, остальные — его остаток и запись. Если
+ведущий не забрал пачку за окно и FLUSH_TIMEOUT_MARGIN секунд сверху,
+ожидающий запрос забирает свой комментарий и записывает его сам.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Comment, Post
+from .signals import posts_bulk_changed
+
+FLUSH_TIMEOUT_MARGIN = 5
+
+_lock = threading.Lock()
+_pending = {}
+
+
+class _Batch:
+    def __init__(self):
+        # None — пачку забрал ведущий, комментарии из неё уже не вынуть.
+        self.comments = []
+        self.done = threading.Event()
+        self.post_exists = False
+        self.error = None
+
+
+def enabled():
+    return settings.BLOG_COMMENT_COALESCE_WINDOW > 0
+
+
+def _flush(post_id, comments):
+    if not Post.objects.filter(pk=post_id).exists():
+        return False
+    with transaction.atomic():
+        Comment.objects.bulk_create(comments)
+    posts_bulk_changed.send(
+        sender=Comment,
+        post_ids=[post_id],
+        author_ids={comment.author_id for comment in comments},
+        category_ids=(),
+    )
+    return True
+
+
+def add_comment(post_id, comment):
+    """Ставит комментарий в пачку публикации и ждёт её записи.
+
+    Возвращает False, если публикации не существует.
+    """
+    comment.post_id = post_id
+    with _lock:
+        batch = _pending.get(post_id)
+        leader = batch is None
+        if leader:
+            batch = _pending[post_id] = _Batch()
+        batch.comments.append(comment)
+
+    window = settings.BLOG_COMMENT_COALESCE_WINDOW / 1000
+    if leader:
+        time.sleep(window)
+        try:
+            with _lock:
+                del _pending[post_id]
+                comments, batch.comments = batch.comments, None
+            batch.post_exists = _flush(post_id, comments)
+        except Exception as error:
+            batch.error = error
+            raise
+        finally:
+            batch.done.set()
+        return batch.post_exists
+
+    if not batch.done.wait(window + FLUSH_TIMEOUT_MARGIN):
+        with _lock:
+            alone = batch.comments is not None
+            if alone:
+                batch.comments.remove(comment)
+        if alone:
+            return _flush(post_id, [comment])
+        # Ведущий уже пишет пачку с этим комментарием: ждём его ответа.
+        batch.done.wait()
+    if batch.error is not None:
+        raise batch.error
+    return batch.post_exists
@@ -0,0 +1,37 @@
+from functools import lru_cache, partial
+
+from django.conf import settings
+from django.urls import get_script_prefix, reverse
+
+from . import stats
+from .caching import header_cache_key
+
+HEADER_URLS = {
+    'index': 'blog:index',
+    'about': 'pages:about',
+    'rules': 'pages:rules',
+    'create_post': 'blog:create_post',
+    'follow_index': 'blog:follow_index',
+    'logout': 'logout',
+    'login': 'login',
+    'registration': 'registration',
+}
+
+
+@lru_cache(maxsize=None)
+def _header_urls(script_prefix):
+    return {name: reverse(view) for name, view in HEADER_URLS.items()}
+
+
+def categories(request):
+    """Категории для навигации; запрос выполняется только при выводе."""
+    return {'nav_categories': stats.nav_categories}
+
+
+def header(request):
+    """Данные для кэшируемой шапки: ключ фрагмента и адреса ссылок."""
+    return {
+        'header_cache_key': partial(header_cache_key, request),
+        'header_cache_timeout': settings.BLOG_HEADER_CACHE_TIMEOUT,
+        'header_urls': _header_urls(get_script_prefix()),
+    }
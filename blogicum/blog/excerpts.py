@@ -0,0 +1,16 @@
+"""Анонсы публикаций для карточек ленты.
+
+Анонс совпадает с выводом ``text|truncatewords:10|linebreaksbr`` и
+хранится в самой публикации, чтобы ленты не загружали полный текст.
+"""
+from django.template.defaultfilters import linebreaksbr
+from django.utils.text import Truncator
+
+EXCERPT_WORDS = 10
+
+
+def make_excerpt(text):
+    """Возвращает экранированный HTML анонса."""
+    return linebreaksbr(
+        Truncator(text).words(EXCERPT_WORDS, truncate=' …'), autoescape=True
+    )
@@ -0,0 +1,146 @@
+"""Материализованная главная лента.
+
+Каждой видимой публикации соответствует строка ``FeedEntry`` с ключом
+сортировки и полями карточки. Главная страница читает одну таблицу по
+индексу ``(pub_date, post_id)`` без соединений и группировки, а затем
+собирает из строк экземпляры ``Post``. Строки добавляются и удаляются
+сигналами; ``rebuild()`` и ``check()`` используются командами
+rebuild_feed и check_feed.
+"""
+from django.db import transaction
+from django.db.models import Count
+
+from .models import Comment, FeedEntry, Post, User
+
+BATCH_SIZE = 1000
+ENTRY_FIELDS = (
+    'pub_date', 'title', 'excerpt_html', 'image',
+    'author_id', 'category_id', 'location_id',
+)
+# Порядок полей для Post.from_db() — как у полей модели.
+POST_FIELDS = tuple(
+    field.attname for field in Post._meta.concrete_fields
+    if field.attname in {'id', 'is_published', 'is_visible', *ENTRY_FIELDS}
+)
+
+
+def _entry(post, author_username):
+    return FeedEntry(
+        post_id=post.pk,
+        pub_date=post.pub_date,
+        title=post.title,
+        excerpt_html=post.excerpt_html,
+        image=post.image.name or '',
+        author_id=post.author_id,
+        author_username=author_username,
+        category_id=post.category_id,
+        location_id=post.location_id,
+    )
+
+
+def sync_post(post):
+    """Добавляет, обновляет или удаляет строку ленты одной публикации."""
+    if not post.is_visible:
+        FeedEntry.objects.filter(post_id=post.pk).delete()
+        return
+    entry = _entry(post, post.author.username)
+    FeedEntry.objects.update_or_create(
+        post_id=post.pk,
+        defaults={
+            field.attname: getattr(entry, field.attname)
+            for field in FeedEntry._meta.concrete_fields
+            if not field.primary_key
+        }
+    )
+
+
+def sync(post_ids):
+    """Приводит строки ленты указанных публикаций в соответствие с ними."""
+    post_ids = list(post_ids)
+    for start in range(0, len(post_ids), BATCH_SIZE):
+        batch = post_ids[start:start + BATCH_SIZE]
+        posts = (
+            Post.objects.filter(pk__in=batch, is_visible=True)
+            .select_related('author')
+            .only(*ENTRY_FIELDS, 'author__username')
+        )
+        entries = [_entry(post, post.author.username) for post in posts]
+        with transaction.atomic():
+            FeedEntry.objects.filter(post_id__in=batch).delete()
+            FeedEntry.objects.bulk_create(entries)
+
+
+def sync_queryset(queryset):
+    sync(queryset.order_by().values_list('pk', flat=True))
+
+
+def rebuild():
+    """Перестраивает ленту целиком; возвращает число строк."""
+    with transaction.atomic():
+        FeedEntry.objects.all().delete()
+        sync_queryset(Post.objects.published())
+    return FeedEntry.objects.count()
+
+
+def check():
+    """Расхождения ленты с ``full_chain()``: список описаний."""
+    posts = Post.objects.full_chain().iterator(chunk_size=BATCH_SIZE)
+    expected = {
+        post.pk: _entry(post, post.author.username) for post in posts
+    }
+    problems = []
+    stored = set()
+    for entry in FeedEntry.objects.iterator(chunk_size=BATCH_SIZE):
+        stored.add(entry.post_id)
+        original = expected.get(entry.post_id)
+        if original is None:
+            problems.append(f'Лишняя запись: публикация {entry.post_id}')
+            continue
+        changed = [
+            field.attname for field in FeedEntry._meta.concrete_fields
+            if getattr(entry, field.attname)
+            != getattr(original, field.attname)
+        ]
+        if changed:
+            problems.append(
+                f'Публикация {entry.post_id}: '
+                f'расходятся поля {", ".join(changed)}'
+            )
+    problems.extend(
+        f'Нет записи: публикация {post_id}'
+        for post_id in sorted(expected.keys() - stored)
+    )
+    return problems
+
+
+def as_posts(entries):
+    """Экземпляры ``Post`` из строк ленты с авторами и числом комментариев.
+
+    Поля, которых нет в ленте, отложены и загрузятся из базы при
+    обращении к ним.
+    """
+    entries = list(entries)
+    post_ids = [entry.post_id for entry in entries]
+    counts = dict(
+        Comment.objects.filter(post_id__in=post_ids)
+        .order_by().values('post_id').annotate(count=Count('pk'))
+        .values_list('post_id', 'count')
+    )
+    posts = []
+    for entry in entries:
+        values = {'id': entry.post_id, 'is_published': True,
+                  'is_visible': True}
+        values.update(
+            (field, getattr(entry, field)) for field in ENTRY_FIELDS
+        )
+        post = Post.from_db(
+            FeedEntry.objects.db, POST_FIELDS,
+            [values[field] for field in POST_FIELDS]
+        )
+        post.author = User.from_db(
+            FeedEntry.objects.db, ('id', 'username'),
+            (entry.author_id, entry.author_username)
+        )
+        post.comment_count = counts.get(entry.post_id, 0)
+        posts.append(post)
+    return posts
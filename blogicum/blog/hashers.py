@@ -0,0 +1,29 @@
+"""Хэшеры паролей с настраиваемой стоимостью.
+
+Стоимость задаётся в настройках. Хэши, посчитанные с другими
+параметрами или устаревшим алгоритмом, пересчитываются при следующем
+успешном входе пользователя.
+"""
+from django.conf import settings
+from django.contrib.auth.hashers import (Argon2PasswordHasher,
+                                         PBKDF2PasswordHasher)
+
+
+class TunablePBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return settings.PASSWORD_PBKDF2_ITERATIONS
+
+
+class TunableArgon2PasswordHasher(Argon2PasswordHasher):
+    @property
+    def time_cost(self):
+        return settings.PASSWORD_ARGON2_TIME_COST
+
+    @property
+    def memory_cost(self):
+        return settings.PASSWORD_ARGON2_MEMORY_COST
+
+    @property
+    def parallelism(self):
+        return settings.PASSWORD_ARGON2_PARALLELISM
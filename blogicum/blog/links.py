@@ -0,0 +1,30 @@
+"""Быстрое построение адресов для циклов в шаблонах.
+
+``reverse()`` на каждый вызов перебирает шаблоны маршрутов. Здесь
+маршрут разворачивается один раз с метками вместо аргументов, после
+чего адреса собираются подстановкой в готовый шаблон строки.
+"""
+from functools import lru_cache
+from urllib.parse import quote
+
+from django.urls import get_script_prefix, reverse
+
+# Как в django.urls.resolvers: подразделители RFC 3986 и ~:@.
+SAFE_CHARS = "!$&'()*+,;=~:@"
+# Числовые метки проходят проверку конвертеров int, slug и str.
+SENTINEL_BASE = 10 ** 17
+
+
+@lru_cache(maxsize=None)
+def _url_template(viewname, arity, script_prefix):
+    sentinels = [str(SENTINEL_BASE + number) for number in range(arity)]
+    template = reverse(viewname, args=sentinels).replace('%', '%%')
+    for sentinel in sentinels:
+        template = template.replace(sentinel, '%s', 1)
+    return template
+
+
+def build_url(viewname, *args):
+    """Аналог ``reverse(viewname, args=args)`` без обхода маршрутов."""
+    template = _url_template(viewname, len(args), get_script_prefix())
+    return template % tuple(quote(str(arg), safe=SAFE_CHARS) for arg in args)
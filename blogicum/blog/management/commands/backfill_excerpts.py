@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import feed, markup
+from blog.excerpts import make_excerpt
+from blog.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        'Заполняет анонсы публикаций по полному тексту. Нужен после '
+        'миграции, импорта в обход save() или смены правил анонса.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--missing', action='store_true',
+            help='Обработать только публикации без анонса.'
+        )
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts = Post.objects.order_by('pk').only('pk', 'text', 'text_format')
+        if options['missing']:
+            posts = posts.filter(excerpt_html='')
+
+        count = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            for post in batch:
+                post.excerpt_html = make_excerpt(
+                    markup.plain_text(post.text, post.text_format)
+                )
+            with transaction.atomic():
+                Post.objects.bulk_update(batch, ['excerpt_html'])
+            # bulk_update обходит сигналы, а лента хранит копию анонса.
+            feed.sync(post.pk for post in batch)
+            last_pk = batch[-1].pk
+            count += len(batch)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено анонсов: {count}')
+        )
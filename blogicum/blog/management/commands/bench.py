@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from blog.benchmarks import SCENARIOS, temporary_database
+
+
+class Command(BaseCommand):
+    help = 'Запускает сценарий замера производительности на временной базе.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('scenario', choices=sorted(SCENARIOS))
+        parser.add_argument(
+            '--size', type=int, default=1000,
+            help='Объём тестовых данных, например число публикаций.'
+        )
+        parser.add_argument(
+            '--requests', type=int, default=200,
+            help='Число запросов или повторений замера.'
+        )
+        parser.add_argument(
+            '--concurrency', type=int, default=20,
+            help='Число одновременных клиентов.'
+        )
+
+    def handle(self, *args, scenario, **options):
+        with temporary_database():
+            SCENARIOS[scenario](self.stdout, **options)
@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from blog import sitemaps
+
+
+class Command(BaseCommand):
+    help = 'Строит индекс sitemap.xml и сжатые дочерние карты сайта.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--base-url', default=settings.SITE_URL,
+            help='Схема и домен для абсолютных адресов в картах сайта.'
+        )
+        parser.add_argument(
+            '--max-urls', type=int, default=settings.SITEMAP_MAX_URLS,
+            help='Максимальное число адресов в одном дочернем файле.'
+        )
+        parser.add_argument(
+            '--output', default=settings.SITEMAP_ROOT,
+            help='Каталог, в который записываются файлы.'
+        )
+
+    def handle(self, *args, **options):
+        filenames = sitemaps.build(
+            directory=options['output'],
+            base_url=options['base_url'],
+            max_urls=options['max_urls'],
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Записано карт сайта: {len(filenames)}'
+        ))
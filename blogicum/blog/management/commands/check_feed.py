@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from blog import feed
+
+
+class Command(BaseCommand):
+    help = (
+        'Сверяет материализованную главную ленту с full_chain(). '
+        'При расхождениях завершается с ошибкой.'
+    )
+
+    def handle(self, *args, **options):
+        problems = feed.check()
+        for problem in problems:
+            self.stderr.write(problem)
+        if problems:
+            raise CommandError(
+                f'Расхождений: {len(problems)}; выполните rebuild_feed.'
+            )
+        self.stdout.write(self.style.SUCCESS('Лента согласована.'))
@@ -0,0 +1,145 @@
+import csv
+import gzip
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.dateparse import parse_datetime
+
+from blog.models import Comment, Post
+
+EXPORTS = {
+    'posts': (
+        Post,
+        ['id', 'title', 'text', 'pub_date', 'created_at', 'is_published',
+         'author_id', 'category_id', 'location_id', 'image'],
+    ),
+    'comments': (
+        Comment,
+        ['id', 'post_id', 'author_id', 'text', 'created_at'],
+    ),
+}
+
+
+class JsonLinesWriter:
+    def __init__(self, stream, fields):
+        self.stream = stream
+        self.fields = fields
+        self.encoder = DjangoJSONEncoder(ensure_ascii=False)
+
+    def write(self, row):
+        self.stream.write(
+            self.encoder.encode(dict(zip(self.fields, row))) + '\n'
+        )
+
+
+class CsvWriter:
+    def __init__(self, stream, fields):
+        self.writer = csv.writer(stream)
+        self.writer.writerow(fields)
+
+    def write(self, row):
+        self.writer.writerow(
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in row
+        )
+
+
+WRITERS = {'jsonl': JsonLinesWriter, 'csv': CsvWriter}
+
+
+class Command(BaseCommand):
+    help = (
+        'Потоково выгружает публикации или комментарии в JSONL или CSV. '
+        'Память не зависит от размера таблицы.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', choices=EXPORTS)
+        parser.add_argument('--format', choices=WRITERS, default='jsonl')
+        parser.add_argument(
+            '--output', default='-',
+            help='Файл для записи; по умолчанию стандартный вывод.'
+        )
+        parser.add_argument(
+            '--gzip', action='store_true', help='Сжать вывод gzip.'
+        )
+        parser.add_argument(
+            '--since',
+            help='Выгрузить только записи, добавленные после этого момента '
+                 '(ISO 8601).'
+        )
+        parser.add_argument(
+            '--watermark-file',
+            help='Файл с отметкой последней выгрузки: читается вместо '
+                 '--since и обновляется после успешной выгрузки.'
+        )
+        parser.add_argument('--chunk-size', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        model, fields = EXPORTS[options['model']]
+        since = self.get_since(options)
+
+        rows = model.objects.order_by('created_at', 'pk')
+        if since is not None:
+            rows = rows.filter(created_at__gt=since)
+        rows = rows.values_list(*fields).iterator(
+            chunk_size=options['chunk_size']
+        )
+
+        watermark_index = fields.index('created_at')
+        watermark = since
+        count = 0
+        with self.open_output(options) as stream:
+            writer = WRITERS[options['format']](stream, fields)
+            for row in rows:
+                writer.write(row)
+                watermark = row[watermark_index]
+                count += 1
+
+        if options['watermark_file'] and watermark is not None:
+            with open(options['watermark_file'], 'w') as file:
+                file.write(watermark.isoformat())
+        self.stderr.write(f'Выгружено записей: {count}')
+
+    def get_since(self, options):
+        value = options['since']
+        if options['watermark_file']:
+            try:
+                with open(options['watermark_file']) as file:
+                    value = file.read().strip() or value
+            except FileNotFoundError:
+                pass
+        if not value:
+            return None
+        since = parse_datetime(value)
+        if since is None:
+            raise CommandError(f'Некорректная дата: {value}')
+        return since
+
+    def open_output(self, options):
+        path = options['output']
+        if options['gzip']:
+            return gzip.open(
+                sys.stdout.buffer if path == '-' else path,
+                'wt', encoding='utf-8', newline=''
+            )
+        if path == '-':
+            return _OutputStream(self.stdout)
+        return open(path, 'w', encoding='utf-8', newline='')
+
+
+class _OutputStream:
+    """Запись в stdout команды без добавления переводов строк."""
+
+    def __init__(self, output):
+        self.output = output
+
+    def write(self, data):
+        self.output.write(data, ending='')
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.output.flush()
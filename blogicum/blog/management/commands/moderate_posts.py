@@ -0,0 +1,70 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_datetime
+
+from blog import moderation
+
+
+def datetime_argument(value):
+    moment = parse_datetime(value)
+    if moment is None:
+        raise ValueError(value)
+    return moment
+
+
+class Command(BaseCommand):
+    help = (
+        'Пакетно публикует, снимает с публикации или удаляет публикации '
+        'по автору, категории, интервалу дат или фрагменту текста.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'action', choices=('publish', 'unpublish', 'delete')
+        )
+        parser.add_argument('--author', help='Имя пользователя автора.')
+        parser.add_argument('--category', help='Слаг категории.')
+        parser.add_argument(
+            '--since', type=datetime_argument,
+            help='Дата публикации не раньше (ISO 8601).'
+        )
+        parser.add_argument(
+            '--until', type=datetime_argument,
+            help='Дата публикации раньше (ISO 8601).'
+        )
+        parser.add_argument(
+            '--pattern', help='Фрагмент заголовка или текста.'
+        )
+        parser.add_argument(
+            '--batch-size', type=int, default=moderation.BATCH_SIZE
+        )
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Только посчитать подходящие публикации.'
+        )
+
+    def handle(self, *args, **options):
+        filters = {
+            key: options[key]
+            for key in ('author', 'category', 'since', 'until', 'pattern')
+        }
+        if not any(value is not None for value in filters.values()):
+            raise CommandError(
+                'Укажите хотя бы один фильтр: --author, --category, '
+                '--since, --until или --pattern.'
+            )
+        posts = moderation.filter_posts(**filters)
+        if options['dry_run']:
+            self.stdout.write(f'Подходящих публикаций: {posts.count()}')
+            return
+
+        action = options['action']
+        batch_size = options['batch_size']
+        if action == 'delete':
+            count = moderation.delete_posts(posts, batch_size)
+        else:
+            count = moderation.set_published(
+                posts, action == 'publish', batch_size
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f'Затронуто публикаций: {count}')
+        )
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from blog import feed
+
+
+class Command(BaseCommand):
+    help = 'Перестраивает материализованную главную ленту по публикациям.'
+
+    def handle(self, *args, **options):
+        count = feed.rebuild()
+        self.stdout.write(
+            self.style.SUCCESS(f'Записей в ленте: {count}')
+        )
@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from blog import markup
+from blog.models import Post, PostRender
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересобирает сохранённый HTML Markdown-публикаций, текст которых '
+        'изменён в обход save(). Страницы такие публикации рендерят '
+        'в памяти при каждом чтении.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000)
+
+    def handle(self, *args, **options):
+        posts = (
+            Post.objects.filter(text_format=markup.MARKDOWN)
+            .select_related('rendered')
+            .only('pk', 'text', 'text_format', 'rendered')
+            .order_by('pk')
+        )
+        count = 0
+        last_pk = 0
+        while True:
+            batch = list(
+                posts.filter(pk__gt=last_pk)[:options['batch_size']]
+            )
+            if not batch:
+                break
+            renders = []
+            for post in batch:
+                digest = markup.digest(post.text, post.text_format)
+                stored = getattr(post, 'rendered', None)
+                if stored is None or stored.digest != digest:
+                    renders.append(PostRender(
+                        post_id=post.pk,
+                        digest=digest,
+                        html=markup.render(post.text, post.text_format),
+                    ))
+            with transaction.atomic():
+                PostRender.objects.filter(
+                    post_id__in=[render.post_id for render in renders]
+                ).delete()
+                PostRender.objects.bulk_create(renders)
+            last_pk = batch[-1].pk
+            count += len(renders)
+        self.stdout.write(
+            self.style.SUCCESS(f'Обновлено HTML публикаций: {count}')
+        )
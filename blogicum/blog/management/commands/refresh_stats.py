@@ -0,0 +1,34 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from blog import stats
+
+
+class Command(BaseCommand):
+    help = (
+        'Пересчитывает предрасчитанную статистику авторов и категорий.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--authors', action='store_true',
+            help='Пересчитать только статистику авторов.'
+        )
+        parser.add_argument(
+            '--categories', action='store_true',
+            help='Пересчитать только статистику категорий.'
+        )
+
+    def handle(self, *args, **options):
+        refresh_all = not (options['authors'] or options['categories'])
+        if refresh_all or options['authors']:
+            user_ids = User.objects.order_by('pk').values_list('pk', flat=True)
+            stats.refresh_authors(user_ids.iterator())
+            self.stdout.write(
+                self.style.SUCCESS('Статистика авторов обновлена.')
+            )
+        if refresh_all or options['categories']:
+            stats.refresh_categories()
+            self.stdout.write(
+                self.style.SUCCESS('Статистика категорий обновлена.')
+            )
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand
+
+from blog.publishing import BATCH_SIZE, MAX_SLEEP, Publisher
+
+
+class Command(BaseCommand):
+    help = (
+        'Показывает в лентах отложенные публикации, когда наступает их '
+        'дата. Без --once работает постоянно и спит до ближайшей даты.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once', action='store_true',
+            help='Один проход, например для запуска из cron.'
+        )
+        parser.add_argument(
+            '--max-sleep', type=float, default=MAX_SLEEP,
+            help='Наибольшая пауза между проходами, секунды.'
+        )
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        publisher = Publisher(
+            max_sleep=options['max_sleep'],
+            batch_size=options['batch_size']
+        )
+        if options['once']:
+            count = publisher.run_once()
+            self.stdout.write(
+                self.style.SUCCESS(f'Опубликовано постов: {count}')
+            )
+            return
+        try:
+            publisher.run()
+        except KeyboardInterrupt:
+            pass
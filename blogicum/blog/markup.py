@@ -0,0 +1,159 @@
+"""Разметка текста публикаций.
+
+Поддерживается обычный текст и упрощённый Markdown: заголовки ``#``,
+списки, цитаты, блоки кода, ``**полужирный**``, ``*курсив*``, код
+в обратных кавычках и ссылки ``[текст](https://…)``. Исходный текст
+сначала экранируется целиком, поэтому HTML автора в результат
+не попадает.
+
+Готовый HTML Markdown-публикаций хранится в ``PostRender`` вместе с
+хэшем ``digest()`` исходного текста: он строится при сохранении
+публикации, а страницы только читают его. Обычный текст дёшев и
+рендерится при каждом показе.
+"""
+import hashlib
+import re
+from html import unescape
+from itertools import takewhile
+
+from django.template.defaultfilters import linebreaksbr
+from django.utils.html import escape, strip_tags
+
+PLAIN = 'plain'
+MARKDOWN = 'markdown'
+FORMATS = (
+    (PLAIN, 'Обычный текст'),
+    (MARKDOWN, 'Markdown'),
+)
+
+HEADING = re.compile(r'^(#{1,3})\s+(.*)$')
+BULLET = re.compile(r'^[-*]\s+(.*)$')
+NUMBERED = re.compile(r'^\d+[.)]\s+(.*)$')
+QUOTE = re.compile(r'^&gt;\s?(.*)$')
+FENCE = '```'
+BLOCK_PATTERNS = (
+    ('heading', HEADING),
+    ('ul', BULLET),
+    ('ol', NUMBERED),
+    ('quote', QUOTE),
+)
+
+CODE_SPAN = re.compile(r'`([^`]+)`')
+LINK = re.compile(r'\[([^\]]+)\]\(([^)\s]+)\)')
+STRONG = re.compile(r'\*\*(.+?)\*\*')
+EMPHASIS = re.compile(r'(?<![\w*])\*(?!\s)(.+?)(?<!\s)\*(?![\w*])')
+SAFE_URL = re.compile(r'^(https?://|mailto:|/)', re.IGNORECASE)
+PLACEHOLDER = re.compile('\x00(\\d+)\x00')
+
+
+def _link(match):
+    text, url = match.groups()
+    if not SAFE_URL.match(url):
+        return match[0]
+    return f'<a href="{url}" rel="nofollow">{_emphasis(text)}</a>'
+
+
+def _emphasis(text):
+    text = STRONG.sub(r'<strong>\1</strong>', text)
+    return EMPHASIS.sub(r'<em>\1</em>', text)
+
+
+def _inline(text):
+    # Код и готовые ссылки прячутся от правил выделения, иначе звёздочки
+    # внутри них превратились бы в теги.
+    spans = []
+
+    def stash(html):
+        spans.append(html)
+        return f'\x00{len(spans) - 1}\x00'
+
+    def restore(match):
+        return PLACEHOLDER.sub(restore, spans[int(match[1])])
+
+    text = CODE_SPAN.sub(
+        lambda match: stash(f'<code>{match[1]}</code>'), text
+    )
+    text = LINK.sub(lambda match: stash(_link(match)), text)
+    return PLACEHOLDER.sub(restore, _emphasis(text))
+
+
+def _kind(line):
+    if line.strip() == FENCE:
+        return 'code'
+    if not line.strip():
+        return None
+    for kind, pattern in BLOCK_PATTERNS:
+        if pattern.match(line):
+            return kind
+    return 'p'
+
+
+def _blocks(lines):
+    """Разбивает экранированные строки на блоки (вид, строки)."""
+    kind, block = None, []
+    lines = iter(lines)
+    for line in lines:
+        line_kind = _kind(line)
+        if block and (line_kind != kind or kind == 'heading'):
+            yield kind, block
+            block = []
+        kind = line_kind
+        if kind == 'code':
+            yield kind, list(
+                takewhile(lambda code: code.strip() != FENCE, lines)
+            )
+        elif kind is not None:
+            block.append(line)
+    if block:
+        yield kind, block
+
+
+def render_markdown(text):
+    html = []
+    text = text.replace('\x00', '').replace('\r\n', '\n')
+    lines = escape(text).split('\n')
+    for kind, block in _blocks(lines):
+        if kind == 'code':
+            html.append('<pre><code>' + '\n'.join(block) + '</code></pre>')
+        elif kind == 'heading':
+            level, content = HEADING.match(block[0]).groups()
+            tag = f'h{len(level) + 3}'
+            html.append(f'<{tag}>{_inline(content)}</{tag}>')
+        elif kind in ('ul', 'ol'):
+            pattern = BULLET if kind == 'ul' else NUMBERED
+            items = '\n'.join(
+                f'<li>{_inline(pattern.match(line)[1])}</li>'
+                for line in block
+            )
+            html.append(f'<{kind}>{items}</{kind}>')
+        elif kind == 'quote':
+            content = '<br>'.join(
+                _inline(QUOTE.match(line)[1]) for line in block
+            )
+            html.append(f'<blockquote>{content}</blockquote>')
+        else:
+            html.append('<p>' + '<br>'.join(map(_inline, block)) + '</p>')
+    return '\n'.join(html)
+
+
+def render(text, text_format):
+    """Безопасный HTML текста в указанном формате."""
+    if text_format == MARKDOWN:
+        return render_markdown(text)
+    return str(linebreaksbr(text, autoescape=True))
+
+
+def digest(text, text_format):
+    """Хэш формата и текста, по которому сверяется сохранённый HTML."""
+    return hashlib.sha1(f'{text_format}:{text}'.encode()).hexdigest()
+
+
+def plain_text(text, text_format, html=None):
+    """Текст без разметки, например для анонса.
+
+    ``html`` — уже построенный HTML, чтобы не рендерить текст повторно.
+    """
+    if text_format == MARKDOWN:
+        html = render_markdown(text) if html is None else html
+        return unescape(strip_tags(html.replace('<br>', '\n')))
+    return text
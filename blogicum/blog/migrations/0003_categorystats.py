@@ -0,0 +1,26 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:43
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0002_authorstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CategoryStats',
+            fields=[
+                ('category', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='blog.category', verbose_name='Категория')),
+                ('posts_count', models.PositiveIntegerField(default=0, verbose_name='Опубликованных постов')),
+                ('last_post_at', models.DateTimeField(blank=True, null=True, verbose_name='Последняя публикация')),
+            ],
+            options={
+                'verbose_name': 'статистика категории',
+                'verbose_name_plural': 'Статистика категорий',
+            },
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:55
+
+from django.db import migrations, models
+
+from blog.excerpts import make_excerpt
+
+BATCH_SIZE = 1000
+
+
+def fill_excerpts(apps, schema_editor):
+    # Формата текста ещё нет: все публикации — обычный текст.
+    Post = apps.get_model('blog', 'Post')
+    posts = Post.objects.order_by('pk').only('pk', 'text')
+    last_pk = 0
+    while True:
+        batch = list(posts.filter(pk__gt=last_pk)[:BATCH_SIZE])
+        if not batch:
+            break
+        for post in batch:
+            post.excerpt_html = make_excerpt(post.text)
+        Post.objects.bulk_update(batch, ['excerpt_html'])
+        last_pk = batch[-1].pk
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_post_comment_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='excerpt_html',
+            field=models.TextField(blank=True, editable=False, verbose_name='Анонс в HTML'),
+        ),
+        migrations.RunPython(fill_excerpts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_post_excerpt_html'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='text_format',
+            field=models.CharField(blank=True, choices=[('plain', 'Обычный текст'), ('markdown', 'Markdown')], default='plain', help_text='Markdown: # заголовок, **полужирный**, *курсив*, `код`, [ссылка](https://…), списки «- » и «1. ».', max_length=16, verbose_name='Формат текста'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 3.2.16 on 2026-10-19 19:59
+
+from django.db import migrations, models
+from django.db.models.functions import Now
+
+
+def fill_visibility(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    Post.objects.filter(
+        is_published=True,
+        pub_date__lte=Now(),
+        category__is_published=True
+    ).update(is_visible=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0006_post_text_format'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='is_visible',
+            field=models.BooleanField(default=False, editable=False, help_text='Опубликована, дата наступила и категория опубликована.', verbose_name='Видна в лентах'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_visible', True)), fields=['-pub_date'], name='post_visible_pub_date_idx'),
+        ),
+        migrations.RunPython(fill_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0007_post_is_visible'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(condition=models.Q(('is_published', True), ('is_visible', False)), fields=['pub_date'], name='post_pending_pub_date_idx'),
+        ),
+    ]
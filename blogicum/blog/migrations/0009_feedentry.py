@@ -0,0 +1,67 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:01
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+BATCH_SIZE = 1000
+FIELDS = (
+    'pub_date', 'title', 'excerpt_html', 'image',
+    'author_id', 'category_id', 'location_id',
+)
+
+
+def fill_feed(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    FeedEntry = apps.get_model('blog', 'FeedEntry')
+    rows = (
+        Post.objects.filter(is_visible=True)
+        .values_list('pk', 'author__username', *FIELDS)
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    entries = []
+    for pk, username, *values in rows:
+        fields = dict(zip(FIELDS, values))
+        fields['image'] = fields['image'] or ''
+        entries.append(
+            FeedEntry(post_id=pk, author_username=username, **fields)
+        )
+        if len(entries) == BATCH_SIZE:
+            FeedEntry.objects.bulk_create(entries)
+            entries = []
+    FeedEntry.objects.bulk_create(entries)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('blog', '0008_post_pending_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='FeedEntry',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='feed_entry', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('pub_date', models.DateTimeField(verbose_name='Дата и время публикации')),
+                ('title', models.CharField(max_length=256, verbose_name='Заголовок')),
+                ('excerpt_html', models.TextField(blank=True, verbose_name='Анонс в HTML')),
+                ('image', models.CharField(blank=True, max_length=100, verbose_name='Изображение')),
+                ('author_username', models.CharField(max_length=150, verbose_name='Имя пользователя автора')),
+                ('author', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL, verbose_name='Автор публикации')),
+                ('category', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.category', verbose_name='Категория')),
+                ('location', models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='blog.location', verbose_name='Местоположение')),
+            ],
+            options={
+                'verbose_name': 'запись ленты',
+                'verbose_name_plural': 'Записи ленты',
+                'ordering': ('-pub_date', '-post_id'),
+            },
+        ),
+        migrations.AddIndex(
+            model_name='feedentry',
+            index=models.Index(fields=['-pub_date', '-post'], name='feed_entry_order_idx'),
+        ),
+        migrations.RunPython(fill_feed, migrations.RunPython.noop),
+    ]
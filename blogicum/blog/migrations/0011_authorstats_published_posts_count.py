@@ -0,0 +1,36 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:16
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def fill_published_posts_count(apps, schema_editor):
+    AuthorStats = apps.get_model('blog', 'AuthorStats')
+    Post = apps.get_model('blog', 'Post')
+    published = (
+        Post.objects.filter(author_id=OuterRef('user_id'), is_visible=True)
+        .order_by().values('author_id').annotate(count=Count('pk'))
+        .values('count')
+    )
+    AuthorStats.objects.update(
+        published_posts_count=Coalesce(Subquery(published), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_follow_timeline'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='authorstats',
+            name='published_posts_count',
+            field=models.PositiveIntegerField(default=0, verbose_name='Опубликованных публикаций'),
+        ),
+        migrations.RunPython(
+            fill_published_posts_count, migrations.RunPython.noop
+        ),
+    ]
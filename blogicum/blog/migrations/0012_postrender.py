@@ -0,0 +1,52 @@
+# Generated by Django 3.2.16 on 2026-10-19 20:20
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+from blog import markup
+
+BATCH_SIZE = 1000
+
+
+def fill_renders(apps, schema_editor):
+    Post = apps.get_model('blog', 'Post')
+    PostRender = apps.get_model('blog', 'PostRender')
+    posts = (
+        Post.objects.filter(text_format=markup.MARKDOWN)
+        .values_list('pk', 'text', 'text_format')
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    PostRender.objects.bulk_create(
+        (
+            PostRender(
+                post_id=pk,
+                digest=markup.digest(text, text_format),
+                html=markup.render(text, text_format),
+            )
+            for pk, text, text_format in posts
+        ),
+        batch_size=BATCH_SIZE
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_authorstats_published_posts_count'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PostRender',
+            fields=[
+                ('post', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rendered', serialize=False, to='blog.post', verbose_name='Публикация')),
+                ('digest', models.CharField(max_length=40, verbose_name='Хэш текста')),
+                ('html', models.TextField(verbose_name='HTML')),
+            ],
+            options={
+                'verbose_name': 'HTML публикации',
+                'verbose_name_plural': 'HTML публикаций',
+            },
+        ),
+        migrations.RunPython(fill_renders, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,12 @@
+from django.conf import settings
 from django.contrib.auth.models import User
 from django.db import models
+from django.utils import timezone
+from django.utils.safestring import mark_safe
 
+from . import markup
+from .excerpts import make_excerpt
+from .links import build_url
 from .querysets import PostQuerySet
 
 
@@ -39,6 +45,9 @@ class Category(TimestampedPublishedModel):
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return build_url('blog:category_posts', self.slug)
+
 
 class Location(TimestampedPublishedModel):
     name = models.CharField(max_length=256, verbose_name='Название места')
@@ -55,6 +64,15 @@ class Location(TimestampedPublishedModel):
 class Post(TimestampedPublishedModel):
     title = models.CharField(max_length=256, verbose_name='Заголовок')
     text = models.TextField(verbose_name='Текст')
+    text_format = models.CharField(
+        max_length=16,
+        choices=markup.FORMATS,
+        default=markup.PLAIN,
+        blank=True,
+        verbose_name='Формат текста',
+        help_text='Markdown: # заголовок, **полужирный**, *курсив*, '
+                  '`код`, [ссылка](https://…), списки «- » и «1. ».'
+    )
     pub_date = models.DateTimeField(
         verbose_name='Дата и время публикации',
         help_text='Если установить дату и время в будущем — '
@@ -88,17 +106,144 @@ class Post(TimestampedPublishedModel):
         null=True,
         verbose_name='Изображение'
     )
+    excerpt_html = models.TextField(
+        editable=False,
+        blank=True,
+        verbose_name='Анонс в HTML'
+    )
+
+    is_visible = models.BooleanField(
+        default=False,
+        editable=False,
+        verbose_name='Видна в лентах',
+        help_text='Опубликована, дата наступила и категория опубликована.'
+    )
 
     objects = PostQuerySet.as_manager()
 
     class Meta:
         ordering = ('-pub_date',)
+        indexes = [
+            models.Index(fields=['pub_date'], name='post_pub_date_idx'),
+            models.Index(
+                fields=['is_published', 'pub_date'],
+                name='post_published_pub_date_idx'
+            ),
+            models.Index(
+                fields=['-pub_date'],
+                name='post_visible_pub_date_idx',
+                condition=models.Q(is_visible=True)
+            ),
+            models.Index(
+                fields=['pub_date'],
+                name='post_pending_pub_date_idx',
+                condition=models.Q(is_published=True, is_visible=False)
+            ),
+        ]
         verbose_name = 'публикация'
         verbose_name_plural = 'Публикации'
 
     def __str__(self):
         return self.title
 
+    def get_absolute_url(self):
+        return build_url('blog:post_detail', self.pk)
+
+    @property
+    def text_html(self):
+        """HTML текста; для Markdown берётся из ``PostRender``.
+
+        Если сохранённый HTML отсутствует или построен по другому тексту
+        (например, после ``update()`` в обход ``save()``), он строится
+        в памяти: чтение страницы не пишет в базу. Сохраняют HTML
+        ``save()`` и команда rebuild_renders.
+        """
+        if self.text_format == markup.MARKDOWN:
+            stored = getattr(self, 'rendered', None)
+            if stored is not None and stored.digest == markup.digest(
+                self.text, self.text_format
+            ):
+                return mark_safe(stored.html)
+        return mark_safe(markup.render(self.text, self.text_format))
+
+    def _store_render(self, html):
+        stored, _ = PostRender.objects.update_or_create(
+            post=self,
+            defaults={
+                'digest': markup.digest(self.text, self.text_format),
+                'html': html,
+            }
+        )
+        Post.rendered.related.set_cached_value(self, stored)
+        return stored
+
+    def _clean_pub_date(self):
+        """Дата публикации как aware datetime, даже если задана строкой."""
+        pub_date = self._meta.get_field('pub_date').to_python(self.pub_date)
+        if pub_date and settings.USE_TZ and timezone.is_naive(pub_date):
+            pub_date = timezone.make_aware(pub_date)
+        return pub_date
+
+    def check_visibility(self, category_published=None):
+        """Условие ``PostQuerySet.sync_visibility()`` для этой публикации.
+
+        ``category_published`` — уже известное состояние категории; без
+        него берётся загруженная категория, а если её нет — из базы.
+        """
+        pub_date = self._clean_pub_date()
+        if not (
+            self.is_published
+            and pub_date is not None
+            and pub_date <= timezone.now()
+            and self.category_id is not None
+        ):
+            return False
+        if category_published is None:
+            category_published = self.category.is_published
+        return category_published
+
+    def save(self, *args, update_fields=None, **kwargs):
+        self.text_format = self.text_format or markup.PLAIN
+        html = None
+        if self.text_format == markup.MARKDOWN:
+            html = markup.render(self.text, self.text_format)
+        self.excerpt_html = make_excerpt(
+            markup.plain_text(self.text, self.text_format, html)
+        )
+        self.pub_date = self._clean_pub_date()
+        # is_visible вычисляет post_pre_save: он уже читает прежнюю строку
+        # и заодно получает состояние категории без отдельного запроса.
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if {'text', 'text_format'} & update_fields:
+                update_fields.add('excerpt_html')
+            if {'is_published', 'pub_date', 'category'} & update_fields:
+                update_fields.add('is_visible')
+        super().save(*args, update_fields=update_fields, **kwargs)
+        if html is not None:
+            self._store_render(html)
+
+
+class PostRender(models.Model):
+    """Готовый HTML Markdown-публикации и хэш исходного текста."""
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='rendered',
+        verbose_name='Публикация'
+    )
+    digest = models.CharField(max_length=40, verbose_name='Хэш текста')
+    html = models.TextField(verbose_name='HTML')
+
+    class Meta:
+        verbose_name = 'HTML публикации'
+        verbose_name_plural = 'HTML публикаций'
+
+    def __str__(self):
+        return f'HTML публикации {self.post_id}'
+
 
 class Comment(models.Model):
     post = models.ForeignKey(
@@ -118,6 +263,220 @@ class Comment(models.Model):
         verbose_name = 'комментарий'
         verbose_name_plural = 'Комментарии'
         ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['created_at'], name='comment_created_at_idx'),
+        ]
 
     def __str__(self):
         return f'Комментарий от {self.author} к "{self.post}"'
+
+
+class AuthorStats(models.Model):
+    """Сводная статистика автора для шапки профиля.
+
+    Поддерживается сигналами при создании и удалении публикаций и
+    комментариев и при смене видимости публикаций, полностью
+    пересчитывается командой refresh_stats.
+    """
+
+    user = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='blog_stats',
+        verbose_name='Автор'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0, verbose_name='Публикаций'
+    )
+    published_posts_count = models.PositiveIntegerField(
+        default=0, verbose_name='Опубликованных публикаций'
+    )
+    comments_count = models.PositiveIntegerField(
+        default=0, verbose_name='Комментариев'
+    )
+    last_activity = models.DateTimeField(
+        null=True, blank=True, verbose_name='Последняя активность'
+    )
+    followers_count = models.PositiveIntegerField(
+        default=0, verbose_name='Подписчиков'
+    )
+
+    class Meta:
+        verbose_name = 'статистика автора'
+        verbose_name_plural = 'Статистика авторов'
+
+    def __str__(self):
+        return f'Статистика автора {self.user_id}'
+
+
+class CategoryStats(models.Model):
+    """Число опубликованных постов категории и время последнего из них.
+
+    Пересчитывается при изменении публикаций и категорий, а также
+    периодически командой refresh_stats, чтобы учесть отложенные посты.
+    """
+
+    category = models.OneToOneField(
+        Category,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='stats',
+        verbose_name='Категория'
+    )
+    posts_count = models.PositiveIntegerField(
+        default=0, verbose_name='Опубликованных постов'
+    )
+    last_post_at = models.DateTimeField(
+        null=True, blank=True, verbose_name='Последняя публикация'
+    )
+
+    class Meta:
+        verbose_name = 'статистика категории'
+        verbose_name_plural = 'Статистика категорий'
+
+    def __str__(self):
+        return f'Статистика категории {self.category_id}'
+
+
+class FeedEntry(models.Model):
+    """Строка главной ленты с полями карточки опубликованного поста.
+
+    Поддерживается сигналами при сохранении публикаций, категорий и
+    пакетных изменениях; перестраивается командой rebuild_feed.
+    """
+
+    post = models.OneToOneField(
+        Post,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='feed_entry',
+        verbose_name='Публикация'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+    title = models.CharField(max_length=256, verbose_name='Заголовок')
+    excerpt_html = models.TextField(blank=True, verbose_name='Анонс в HTML')
+    image = models.CharField(
+        max_length=100, blank=True, verbose_name='Изображение'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор публикации'
+    )
+    author_username = models.CharField(
+        max_length=150, verbose_name='Имя пользователя автора'
+    )
+    category = models.ForeignKey(
+        Category,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name='Категория'
+    )
+    location = models.ForeignKey(
+        Location,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+',
+        verbose_name='Местоположение'
+    )
+
+    class Meta:
+        verbose_name = 'запись ленты'
+        verbose_name_plural = 'Записи ленты'
+        ordering = ('-pub_date', '-post_id')
+        indexes = [
+            models.Index(
+                fields=['-pub_date', '-post'], name='feed_entry_order_idx'
+            ),
+            models.Index(
+                fields=['author', '-pub_date'], name='feed_entry_author_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'Запись ленты {self.post_id}'
+
+
+class Follow(models.Model):
+    follower = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='following',
+        verbose_name='Подписчик'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='followers',
+        verbose_name='Автор'
+    )
+    created_at = models.DateTimeField(
+        auto_now_add=True, verbose_name='Добавлено'
+    )
+
+    class Meta:
+        verbose_name = 'подписка'
+        verbose_name_plural = 'Подписки'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['follower', 'author'], name='unique_follow'
+            ),
+            models.CheckConstraint(
+                check=~models.Q(follower=models.F('author')),
+                name='follow_not_self'
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.follower} подписан на {self.author}'
+
+
+class TimelineEntry(models.Model):
+    """Публикация автора, доставленная в ленту подписок читателя.
+
+    Строки создаются при публикации постов авторов с числом подписчиков
+    не больше BLOG_FANOUT_FOLLOWER_LIMIT; посты более популярных авторов
+    подмешиваются в ленту при чтении.
+    """
+
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='timeline',
+        verbose_name='Читатель'
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name='timeline_entries',
+        verbose_name='Публикация'
+    )
+    author = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='+',
+        verbose_name='Автор публикации'
+    )
+    pub_date = models.DateTimeField(verbose_name='Дата и время публикации')
+
+    class Meta:
+        verbose_name = 'запись ленты подписок'
+        verbose_name_plural = 'Записи лент подписок'
+        ordering = ('-pub_date', '-post_id')
+        constraints = [
+            models.UniqueConstraint(
+                fields=['user', 'post'], name='unique_timeline_entry'
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['user', '-pub_date', '-post'],
+                name='timeline_user_order_idx'
+            ),
+        ]
+
+    def __str__(self):
+        return f'Запись ленты {self.user_id}: {self.post_id}'
@@ -0,0 +1,135 @@
+"""Пакетная модерация: множественные UPDATE/DELETE без save() и сигналов.
+
+Каждая пачка обрабатывается одним запросом в своей транзакции, после
+чего один раз отправляется сигнал ``posts_bulk_changed``, по которому
+обновляются статистика и кэши.
+"""
+from django.db import models, router, transaction
+from django.db.models import Q
+
+from .models import Comment, Post
+from .signals import post_published, posts_bulk_changed
+
+BATCH_SIZE = 1000
+
+
+def filter_posts(queryset=None, author=None, category=None, since=None,
+                 until=None, pattern=None):
+    """Публикации по автору, категории, интервалу дат и фрагменту текста."""
+    queryset = Post.objects.all() if queryset is None else queryset
+    if author is not None:
+        queryset = queryset.filter(author__username=author)
+    if category is not None:
+        queryset = queryset.filter(category__slug=category)
+    if since is not None:
+        queryset = queryset.filter(pub_date__gte=since)
+    if until is not None:
+        queryset = queryset.filter(pub_date__lt=until)
+    if pattern:
+        queryset = queryset.filter(
+            Q(title__icontains=pattern) | Q(text__icontains=pattern)
+        )
+    return queryset
+
+
+def _batches(queryset, batch_size, *fields):
+    """Пачки строк по возрастанию pk; обработанные строки не повторяются."""
+    last_pk = 0
+    while True:
+        rows = list(
+            queryset.filter(pk__gt=last_pk).order_by('pk')
+            .values_list('pk', *fields)[:batch_size]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1][0]
+        yield rows
+
+
+def _notify(post_rows, comment_author_ids=()):
+    posts_bulk_changed.send(
+        sender=Post,
+        post_ids={row[0] for row in post_rows},
+        author_ids={row[1] for row in post_rows} | set(comment_author_ids),
+        category_ids={row[2] for row in post_rows} - {None},
+    )
+
+
+def set_published(queryset, is_published, batch_size=BATCH_SIZE):
+    """Публикует или снимает с публикации; возвращает число строк."""
+    queryset = queryset.exclude(is_published=is_published)
+    total = 0
+    for rows in _batches(queryset, batch_size, 'author_id', 'category_id'):
+        batch = Post.objects.filter(pk__in=[row[0] for row in rows])
+        with transaction.atomic():
+            total += batch.update(is_published=is_published)
+            shown, _ = batch.sync_visibility()
+        _notify(rows)
+        if shown:
+            post_published.send(sender=Post, post_ids=shown)
+    return total
+
+
+def _delete_related(model, pks, using):
+    """Удаляет или отвязывает строки, ссылающиеся на удаляемые объекты.
+
+    ``pks`` — подзапрос или список первичных ключей. Каскад обходится
+    рекурсивно: сначала удаляются строки, ссылающиеся на дочерние.
+    Другие варианты ``on_delete`` пакетное удаление не поддерживает —
+    вызывается исключение, и транзакция откатывается.
+    """
+    for relation in model._meta.related_objects:
+        on_delete = getattr(relation, 'on_delete', None)
+        if on_delete is models.DO_NOTHING:
+            continue
+        if on_delete not in (models.CASCADE, models.SET_NULL):
+            raise NotImplementedError(
+                f'Пакетное удаление {model.__name__} не поддерживает '
+                f'связь {relation.related_model.__name__}.'
+                f'{relation.field.name}.'
+            )
+        related = relation.related_model._base_manager.using(using).filter(
+            **{f'{relation.field.name}__in': pks}
+        )
+        if on_delete is models.CASCADE:
+            _delete_related(
+                relation.related_model, related.values('pk'), using
+            )
+            related._raw_delete(using)
+        else:
+            related.update(**{relation.field.name: None})
+
+
+def delete_posts(queryset, batch_size=BATCH_SIZE):
+    """Удаляет публикации вместе с комментариями; возвращает число постов."""
+    using = router.db_for_write(Post)
+    total = 0
+    for rows in _batches(queryset, batch_size, 'author_id', 'category_id'):
+        ids = [row[0] for row in rows]
+        with transaction.atomic(using=using):
+            comment_author_ids = set(
+                Comment.objects.filter(post_id__in=ids)
+                .values_list('author_id', flat=True).distinct()
+            )
+            _delete_related(Post, ids, using)
+            total += Post.objects.filter(pk__in=ids)._raw_delete(using)
+        _notify(rows, comment_author_ids)
+    return total
+
+
+def delete_comments(queryset, batch_size=BATCH_SIZE):
+    """Удаляет комментарии пачками; возвращает число удалённых."""
+    using = router.db_for_write(Comment)
+    total = 0
+    for rows in _batches(queryset, batch_size, 'author_id'):
+        with transaction.atomic(using=using):
+            total += Comment.objects.filter(
+                pk__in=[row[0] for row in rows]
+            )._raw_delete(using)
+        posts_bulk_changed.send(
+            sender=Comment,
+            post_ids=set(),
+            author_ids={row[1] for row in rows},
+            category_ids=set(),
+        )
+    return total
@@ -0,0 +1,49 @@
+import hashlib
+
+from django.core.cache import cache
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+COUNT_CACHE_TIMEOUT = 60
+ESTIMATE_THRESHOLD = 10000
+
+
+class ApproximateCountPaginator(Paginator):
+    """Пагинатор для больших таблиц без точного COUNT(*) на каждый запрос.
+
+    Для нефильтрованного списка в PostgreSQL число строк берётся из
+    статистики планировщика; в остальных случаях точный подсчёт
+    кэшируется на COUNT_CACHE_TIMEOUT секунд.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not hasattr(queryset, 'query'):
+            return super().count
+        estimate = self._estimate(queryset)
+        if estimate is not None and estimate > ESTIMATE_THRESHOLD:
+            return estimate
+        sql, params = queryset.query.sql_with_params()
+        key = 'blog:count:' + hashlib.md5(
+            f'{queryset.db}:{sql}:{params}'.encode()
+        ).hexdigest()
+        count = cache.get(key)
+        if count is None:
+            count = queryset.count()
+            cache.set(key, count, COUNT_CACHE_TIMEOUT)
+        return count
+
+    @staticmethod
+    def _estimate(queryset):
+        connection = connections[queryset.db]
+        if connection.vendor != 'postgresql' or queryset.query.where:
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                'SELECT reltuples FROM pg_class WHERE relname = %s',
+                [queryset.model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return int(row[0]) if row else None
@@ -0,0 +1,105 @@
+"""Отложенные публикации: показ постов, дата которых наступила.
+
+Ленты выбирают публикации по флагу ``is_visible``, поэтому сама по себе
+наступившая ``pub_date`` пост не показывает — флаг переключает
+``publish_due()``. Процесс ``Publisher`` (команда ``run_publisher``)
+вызывает её и спит до даты ближайшей отложенной публикации, которую
+берёт из частичного индекса ``post_pending_pub_date_idx``.
+"""
+import time
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Post
+from .signals import post_published, posts_bulk_changed
+
+BATCH_SIZE = 1000
+MAX_SLEEP = 60
+
+
+def due_posts(now):
+    """Скрытые публикации, которые к моменту ``now`` пора показать."""
+    return Post.objects.filter(
+        is_visible=False,
+        is_published=True,
+        pub_date__lte=now,
+        category__is_published=True
+    )
+
+
+def next_due_at(now):
+    """Дата ближайшей публикации, ожидающей показа после ``now``."""
+    return (
+        Post.objects.filter(
+            is_published=True, is_visible=False, pub_date__gt=now
+        )
+        .order_by('pub_date')
+        .values_list('pub_date', flat=True)
+        .first()
+    )
+
+
+def publish_due(now=None, batch_size=BATCH_SIZE):
+    """Показывает наступившие публикации пачками; возвращает их число.
+
+    На каждую пачку отправляются сигналы ``post_published`` и
+    ``posts_bulk_changed``.
+    """
+    now = now or timezone.now()
+    total = 0
+    while True:
+        rows = list(
+            due_posts(now).order_by('pub_date', 'pk')
+            .values_list('pk', 'author_id', 'category_id')[:batch_size]
+        )
+        if not rows:
+            return total
+        post_ids = [row[0] for row in rows]
+        with transaction.atomic():
+            total += Post.objects.filter(
+                pk__in=post_ids, is_visible=False
+            ).update(is_visible=True)
+        post_published.send(sender=Post, post_ids=post_ids)
+        posts_bulk_changed.send(
+            sender=Post,
+            post_ids=set(post_ids),
+            author_ids={row[1] for row in rows},
+            category_ids={row[2] for row in rows},
+        )
+
+
+class Publisher:
+    """Цикл показа отложенных публикаций.
+
+    Часы и ожидание передаются снаружи, чтобы цикл можно было
+    прогнать в тестах без реального времени. Сон ограничен
+    ``max_sleep`` секундами: так замечаются посты, отложенные уже
+    после того, как публикатор заснул.
+    """
+
+    def __init__(self, clock=timezone.now, sleep=time.sleep,
+                 max_sleep=MAX_SLEEP, batch_size=BATCH_SIZE):
+        self.clock = clock
+        self.sleep = sleep
+        self.max_sleep = max_sleep
+        self.batch_size = batch_size
+
+    def run_once(self):
+        """Показывает наступившие посты; возвращает их число."""
+        return publish_due(self.clock(), self.batch_size)
+
+    def pause(self):
+        """Секунды до ближайшей отложенной публикации."""
+        now = self.clock()
+        next_at = next_due_at(now)
+        if next_at is None:
+            return self.max_sleep
+        return min(max((next_at - now).total_seconds(), 0), self.max_sleep)
+
+    def run(self, iterations=None):
+        count = 0
+        while iterations is None or count < iterations:
+            self.run_once()
+            self.sleep(self.pause())
+            count += 1
@@ -1,15 +1,41 @@
 from django.db import models
-from django.db.models import Count
+from django.db.models import Count, Q
+
+CARD_FIELDS = (
+    'title', 'excerpt_html', 'pub_date', 'image', 'is_published',
+    'author__username', 'category', 'location',
+)
 
 
 class PostQuerySet(models.QuerySet):
 
     def published(self):
-        return self.filter(
+        return self.filter(is_visible=True)
+
+    def sync_visibility(self):
+        """Пересчитывает ``is_visible`` по правилам публикации.
+
+        Возвращает списки id публикаций, которые стали видны и которые
+        скрыты.
+        """
+        rules = Q(
             is_published=True,
             pub_date__lte=models.functions.Now(),
             category__is_published=True
         )
+        shown = list(
+            self.filter(rules, is_visible=False)
+            .order_by().values_list('pk', flat=True)
+        )
+        hidden = list(
+            self.filter(is_visible=True).exclude(rules)
+            .order_by().values_list('pk', flat=True)
+        )
+        if shown:
+            self.model.objects.filter(pk__in=shown).update(is_visible=True)
+        if hidden:
+            self.model.objects.filter(pk__in=hidden).update(is_visible=False)
+        return shown, hidden
 
     def with_relations(self):
         return self.select_related('author', 'location', 'category')
@@ -27,3 +53,19 @@ class PostQuerySet(models.QuerySet):
             .with_comment_count()
             .order_by(*self.model._meta.ordering)
         )
+
+    def cards(self):
+        """Публикации для карточек ленты: только выводимые столбцы.
+
+        Категории и местоположения не загружаются: их подставляет
+        ``registry.attach()``.
+        """
+        return (
+            self.select_related('author')
+            .with_comment_count()
+            .only(*CARD_FIELDS)
+        )
+
+    def category_feed(self, category):
+        """Лента уже проверенной опубликованной категории."""
+        return self.filter(category=category, is_visible=True).cards()
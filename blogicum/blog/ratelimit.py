@@ -0,0 +1,104 @@
+"""Ограничение частоты записи: маркерное ведро по алгоритму GCRA.
+
+Для каждого ключа хранится теоретическое время прибытия (TAT) — момент,
+когда ведро снова станет полным, в миллисекундах. Каждый допущенный
+запрос сдвигает TAT на интервал ``период / лимит``; запрос отклоняется,
+если TAT ушло бы дальше чем на период вперёд. Так подряд проходит не
+больше ``лимита`` запросов, дальше — по одному на интервал, и на
+границах окон нет всплеска до двойного лимита.
+
+Проверка выполняется до любых обращений к ORM: пользователь берётся
+из сессии. TAT хранится в кэше BLOG_RATE_LIMIT_CACHE и меняется только
+атомарными ``add()`` и ``incr()``, поэтому общий для всех процессов кэш
+(Memcached, Redis) даёт общий лимит. С LocMem лимит действует в каждом
+процессе отдельно. Ключ истекает, когда ведро наполняется, поэтому
+сохранённое TAT не отстаёт от текущего времени больше чем на секунду
+точности TTL и сдвиг ``max(TAT, сейчас)`` сводится к ``incr()``.
+"""
+import math
+import re
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.contrib.auth import SESSION_KEY
+from django.core.cache import caches
+from django.http import HttpResponse
+
+RATE_PATTERN = re.compile(r'^(\d+)/([smhd])$')
+PERIODS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+
+def parse_rate(rate):
+    """'10/m' -> (число запросов, период в секундах)."""
+    match = RATE_PATTERN.match(rate)
+    if match is None:
+        raise ValueError(f'Некорректный лимит: {rate}')
+    return int(match[1]), PERIODS[match[2]]
+
+
+def bucket_key(request, scope):
+    user_id = getattr(request, 'session', {}).get(SESSION_KEY)
+    if user_id is not None:
+        return f'blog:ratelimit:{scope}:user:{user_id}'
+    return f'blog:ratelimit:{scope}:ip:{request.META.get("REMOTE_ADDR")}'
+
+
+def consume(key, rate, now=None):
+    """Учитывает запрос; возвращает секунды до следующей попытки или 0."""
+    limit, period = parse_rate(rate)
+    now = int((time.time() if now is None else now) * 1000)
+    period *= 1000
+    interval = period // limit
+    cache = caches[settings.BLOG_RATE_LIMIT_CACHE]
+
+    # Отклонённые запросы не должны сдвигать TAT, поэтому переполненное
+    # ведро отсекается чтением, без incr().
+    tat = cache.get(key)
+    if tat is not None and max(tat, now) + interval - now > period:
+        return (max(tat, now) + interval - now - period) / 1000
+
+    if cache.add(key, now + interval, math.ceil(interval / 1000)):
+        return 0
+    try:
+        tat = cache.incr(key, interval)
+    except ValueError:
+        # Ведро наполнилось и ключ истёк между add() и incr().
+        cache.add(key, now + interval, math.ceil(interval / 1000))
+        return 0
+    excess = max(tat - interval, now) + interval - now - period
+    if excess > 0:
+        # Конкурентный запрос занял последний маркер: вернуть интервал.
+        try:
+            cache.decr(key, interval)
+        except ValueError:
+            pass
+        return excess / 1000
+    # Ключ живёт, пока ведро не наполнится снова.
+    cache.touch(key, max(1, math.ceil((tat - now) / 1000)))
+    return 0
+
+
+def ratelimit(scope):
+    """Ограничивает POST-запросы к представлению лимитом BLOG_RATE_LIMITS.
+
+    Декоратор ставится внешним, чтобы отказ не требовал загрузки
+    пользователя из базы.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            rate = settings.BLOG_RATE_LIMITS.get(scope)
+            if request.method == 'POST' and rate:
+                retry_after = consume(bucket_key(request, scope), rate)
+                if retry_after:
+                    response = HttpResponse(
+                        'Слишком много запросов, попробуйте позже.',
+                        content_type='text/plain; charset=utf-8',
+                        status=429
+                    )
+                    response['Retry-After'] = str(int(retry_after) + 1)
+                    return response
+            return view(request, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,119 @@
+"""Справочник категорий и местоположений в памяти процесса.
+
+Таблицы маленькие и меняются редко, поэтому каждый процесс держит их
+целиком и отдаёт объекты по slug или id без обращения к базе. Снимок
+помечен версией из кэша BLOG_SHARED_CACHE: сигналы сохранения и
+удаления меняют версию, и процессы перечитывают таблицы при следующем
+обращении. Кроме того, снимок живёт не дольше BLOG_REGISTRY_MAX_AGE
+секунд — на случай, если кэш не общий или версия потерялась.
+"""
+import threading
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+from .models import Category, Location, Post
+
+VERSION_KEY = 'blog:registry-version'
+
+
+def _cache():
+    return caches[settings.BLOG_SHARED_CACHE]
+
+
+class _Snapshot:
+    __slots__ = (
+        'version', 'loaded_at', 'categories', 'category_slugs', 'locations'
+    )
+
+    def __init__(self, version):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.categories = {
+            category.pk: category for category in Category.objects.all()
+        }
+        self.category_slugs = {
+            category.slug: category for category in self.categories.values()
+        }
+        self.locations = {
+            location.pk: location for location in Location.objects.all()
+        }
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._snapshot = None
+
+    @staticmethod
+    def _is_stale(snapshot, version):
+        return (
+            snapshot is None
+            or snapshot.version != version
+            or time.monotonic() - snapshot.loaded_at
+            > settings.BLOG_REGISTRY_MAX_AGE
+        )
+
+    def _current(self):
+        cache = _cache()
+        version = cache.get(VERSION_KEY)
+        if version is None:
+            version = uuid.uuid4().hex
+            if not cache.add(VERSION_KEY, version, None):
+                version = cache.get(VERSION_KEY)
+        snapshot = self._snapshot
+        if self._is_stale(snapshot, version):
+            with self._lock:
+                snapshot = self._snapshot
+                if self._is_stale(snapshot, version):
+                    snapshot = self._snapshot = _Snapshot(version)
+        return snapshot
+
+    def category(self, category_id):
+        return self._current().categories.get(category_id)
+
+    def category_by_slug(self, slug):
+        return self._current().category_slugs.get(slug)
+
+    def location(self, location_id):
+        return self._current().locations.get(location_id)
+
+    def attach(self, posts):
+        """Подставляет в публикации категории и местоположения.
+
+        Связанные объекты берутся из справочника и больше не требуют
+        JOIN или отдельного запроса при обращении из шаблона.
+        """
+        snapshot = self._current()
+        for post in posts:
+            Post.category.field.set_cached_value(
+                post, snapshot.categories.get(post.category_id)
+            )
+            Post.location.field.set_cached_value(
+                post, snapshot.locations.get(post.location_id)
+            )
+        return posts
+
+    def clear(self):
+        self._snapshot = None
+
+
+registry = Registry()
+
+
+def _bump():
+    _cache().set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def invalidate():
+    """Сбрасывает справочник во всех процессах.
+
+    Версия меняется сразу и ещё раз после фиксации транзакции, чтобы
+    процесс, успевший перечитать таблицы до фиксации, не сохранил
+    старые данные.
+    """
+    _bump()
+    transaction.on_commit(_bump)
@@ -0,0 +1,153 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import Signal, receiver
+
+from . import feed, stats, timeline
+from .caching import bump_header_version
+from .models import (Category, Comment, FeedEntry, Follow, Location, Post,
+                     TimelineEntry, User)
+from .registry import invalidate as invalidate_registry
+
+PUBLICATION_FIELDS = ('category_id', 'is_published', 'pub_date')
+VISIBILITY_FIELDS = (*PUBLICATION_FIELDS, 'is_visible')
+
+# Пачка публикаций изменена в обход save()/delete(); аргументы:
+# post_ids, author_ids и category_ids затронутых строк.
+posts_bulk_changed = Signal()
+# Публикации стали видны в лентах: сохранены видимыми, показаны
+# публикатором отложенных постов, пакетной модерацией или публикацией
+# категории; аргумент post_ids.
+post_published = Signal()
+
+
+@receiver(pre_save, sender=Post)
+def post_pre_save(sender, instance, raw=False, **kwargs):
+    instance._previous_publication = None
+    if raw:
+        return
+    category_published = None
+    if instance.pk:
+        previous = instance._previous_publication = (
+            Post.objects.filter(pk=instance.pk)
+            .values(*VISIBILITY_FIELDS, 'category__is_published').first()
+        )
+        if previous and previous['category_id'] == instance.category_id:
+            category_published = previous['category__is_published']
+    instance.is_visible = instance.check_visibility(category_published)
+
+
+@receiver(post_save, sender=Post)
+def post_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        stats.post_added(instance)
+    previous = getattr(instance, '_previous_publication', None)
+    if previous and previous['is_visible'] != instance.is_visible:
+        stats.post_visibility_changed(instance)
+    feed.sync_post(instance)
+    if previous is None or any(
+        previous[field] != getattr(instance, field)
+        for field in ('is_visible', 'pub_date')
+    ):
+        timeline.sync([instance.pk])
+    if instance.is_visible and not (previous and previous['is_visible']):
+        post_published.send(sender=Post, post_ids=[instance.pk])
+    stats.post_category_changed(
+        (previous['category_id'], previous['pub_date'])
+        if previous and previous['is_visible'] else None,
+        (instance.category_id, instance.pub_date)
+        if instance.is_visible else None
+    )
+
+
+@receiver(post_delete, sender=Post)
+def post_deleted(sender, instance, **kwargs):
+    stats.post_removed(instance)
+    if instance.is_visible:
+        stats.post_category_changed(
+            (instance.category_id, instance.pub_date), None
+        )
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, raw=False, **kwargs):
+    invalidate_registry()
+    if not raw:
+        shown, hidden = Post.objects.filter(
+            category_id=instance.pk
+        ).sync_visibility()
+        changed = shown + hidden
+        if changed:
+            feed.sync(changed)
+            timeline.sync(changed)
+            stats.refresh_authors(
+                Post.objects.filter(pk__in=changed).order_by()
+                .values_list('author_id', flat=True).distinct()
+            )
+        if shown:
+            post_published.send(sender=Post, post_ids=shown)
+        stats.refresh_categories([instance.pk])
+
+
+@receiver(post_delete, sender=Category)
+def category_deleted(sender, instance, **kwargs):
+    # Публикации удалённой категории уже отвязаны (SET_NULL).
+    invalidate_registry()
+    hidden = Post.objects.filter(category__isnull=True, is_visible=True)
+    author_ids = set(hidden.values_list('author_id', flat=True))
+    hidden.update(is_visible=False)
+    stats.refresh_authors(author_ids)
+    FeedEntry.objects.filter(category__isnull=True).delete()
+    TimelineEntry.objects.filter(post__category__isnull=True).delete()
+
+
+@receiver(post_save, sender=Location)
+@receiver(post_delete, sender=Location)
+def registry_changed(sender, **kwargs):
+    invalidate_registry()
+
+
+@receiver(post_save, sender=Comment)
+def comment_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.comment_added(instance)
+
+
+@receiver(post_delete, sender=Comment)
+def comment_deleted(sender, instance, **kwargs):
+    stats.comment_removed(instance)
+
+
+@receiver(post_save, sender=Follow)
+def follow_saved(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        stats.follower_added(instance)
+
+
+@receiver(post_delete, sender=Follow)
+def follow_deleted(sender, instance, **kwargs):
+    stats.follower_removed(instance)
+    timeline.follower_removed(instance.author_id)
+
+
+@receiver(posts_bulk_changed)
+def posts_bulk_changed_handler(sender, post_ids, author_ids, category_ids,
+                               **kwargs):
+    # Пачки комментариев тоже передают post_ids, но ленты не меняют.
+    if post_ids and sender is Post:
+        feed.sync(post_ids)
+        timeline.sync(post_ids)
+    if author_ids:
+        stats.refresh_authors(author_ids)
+    if category_ids:
+        stats.refresh_categories(category_ids)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    # Вход обновляет только last_login, шапка от него не зависит.
+    if update_fields != frozenset({'last_login'}):
+        bump_header_version(instance.pk)
+        FeedEntry.objects.filter(author_id=instance.pk).exclude(
+            author_username=instance.username
+        ).update(author_username=instance.username)
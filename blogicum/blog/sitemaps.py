@@ -0,0 +1,150 @@
+"""Построение sitemap-файлов для публикаций, категорий и профилей.
+
+Карты сайта строятся заранее командой ``build_sitemaps`` и отдаются
+как статические файлы: дочерние карты сжаты gzip и содержат не более
+``SITEMAP_MAX_URLS`` адресов, индекс ``sitemap.xml`` ссылается на них.
+"""
+import gzip
+import os
+from xml.sax.saxutils import escape
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import Category, Post
+
+SITEMAP_NAMESPACE = 'http://www.sitemaps.org/schemas/sitemap/0.9'
+INDEX_FILENAME = 'sitemap.xml'
+CHUNK_SIZE = 2000
+
+
+def post_entries():
+    rows = (
+        Post.objects.published()
+        .order_by('pk')
+        .values_list('pk', 'pub_date')
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for pk, pub_date in rows:
+        yield reverse('blog:post_detail', args=[pk]), pub_date
+
+
+def category_entries():
+    rows = (
+        Category.objects.filter(is_published=True)
+        .order_by('pk')
+        .values_list('slug', flat=True)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for slug in rows:
+        yield reverse('blog:category_posts', args=[slug]), None
+
+
+def profile_entries():
+    rows = (
+        User.objects.filter(is_active=True)
+        .order_by('pk')
+        .values_list('username', flat=True)
+        .iterator(chunk_size=CHUNK_SIZE)
+    )
+    for username in rows:
+        yield reverse('blog:profile', args=[username]), None
+
+
+SECTIONS = {
+    'posts': post_entries,
+    'categories': category_entries,
+    'profiles': profile_entries,
+}
+
+
+class _AtomicFile:
+    """Файл, который появляется под своим именем только после закрытия."""
+
+    def __init__(self, path, compress=False):
+        self.path = path
+        self.tmp_path = f'{path}.tmp'
+        opener = gzip.open if compress else open
+        self.file = opener(self.tmp_path, 'wt', encoding='utf-8')
+
+    def write(self, data):
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+        os.replace(self.tmp_path, self.path)
+
+
+def _url_element(loc, lastmod=None):
+    element = f'<url><loc>{escape(loc)}</loc>'
+    if lastmod is not None:
+        element += f'<lastmod>{lastmod.isoformat()}</lastmod>'
+    return element + '</url>\n'
+
+
+def _close_shard(shard):
+    if shard is not None:
+        shard.write('</urlset>\n')
+        shard.close()
+
+
+def write_section(directory, section, entries, base_url, max_urls):
+    """Записывает записи раздела в шарды по max_urls адресов.
+
+    Возвращает список имён записанных файлов.
+    """
+    filenames = []
+    shard = None
+    for count, (path, lastmod) in enumerate(entries):
+        if count % max_urls == 0:
+            _close_shard(shard)
+            filename = f'sitemap-{section}-{len(filenames) + 1}.xml.gz'
+            filenames.append(filename)
+            shard = _AtomicFile(
+                os.path.join(directory, filename), compress=True
+            )
+            shard.write(
+                '<?xml version="1.0" encoding="UTF-8"?>\n'
+                f'<urlset xmlns="{SITEMAP_NAMESPACE}">\n'
+            )
+        shard.write(_url_element(base_url + path, lastmod))
+    _close_shard(shard)
+    return filenames
+
+
+def write_index(directory, filenames, base_url, generated_at):
+    index = _AtomicFile(os.path.join(directory, INDEX_FILENAME))
+    index.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<sitemapindex xmlns="{SITEMAP_NAMESPACE}">\n'
+    )
+    for filename in filenames:
+        loc = base_url + reverse('blog:sitemap_section', args=[filename])
+        index.write(
+            f'<sitemap><loc>{escape(loc)}</loc>'
+            f'<lastmod>{generated_at.isoformat()}</lastmod></sitemap>\n'
+        )
+    index.write('</sitemapindex>\n')
+    index.close()
+
+
+def build(directory=None, base_url=None, max_urls=None):
+    """Перестраивает все карты сайта и удаляет устаревшие шарды."""
+    directory = str(directory or settings.SITEMAP_ROOT)
+    base_url = (base_url or settings.SITE_URL).rstrip('/')
+    max_urls = max_urls or settings.SITEMAP_MAX_URLS
+    os.makedirs(directory, exist_ok=True)
+
+    filenames = []
+    for section, entries in SECTIONS.items():
+        filenames += write_section(
+            directory, section, entries(), base_url, max_urls
+        )
+    write_index(directory, filenames, base_url, timezone.now())
+
+    for stale in set(os.listdir(directory)) - set(filenames):
+        if stale.startswith('sitemap-') and stale.endswith('.xml.gz'):
+            os.remove(os.path.join(directory, stale))
+    return filenames
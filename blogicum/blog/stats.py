@@ -0,0 +1,231 @@
+"""Поддержка предрасчитанной статистики авторов и категорий."""
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce, Greatest
+
+from .caching import bump_version, version
+from .models import (AuthorStats, Category, CategoryStats, Comment, Follow,
+                     Post)
+
+REFRESH_BATCH_SIZE = 1000
+NAV_CACHE_KEY = 'blog:nav-categories:{}'
+NAV_VERSION_KEY = 'blog:nav-version'
+NAV_CACHE_TIMEOUT = 300
+
+
+def _increment(user_id, *fields, activity=None):
+    changes = {field: F(field) + 1 for field in fields}
+    if activity is not None:
+        changes['last_activity'] = Greatest(
+            Coalesce('last_activity', activity), activity
+        )
+    updated = AuthorStats.objects.filter(user_id=user_id).update(**changes)
+    if not updated:
+        refresh_authors([user_id])
+
+
+def _decrement(user_id, field):
+    AuthorStats.objects.filter(user_id=user_id, **{f'{field}__gt': 0}).update(
+        **{field: F(field) - 1}
+    )
+
+
+def post_added(post):
+    fields = ['posts_count']
+    if post.is_visible:
+        fields.append('published_posts_count')
+    _increment(post.author_id, *fields, activity=post.created_at)
+
+
+def post_removed(post):
+    _decrement(post.author_id, 'posts_count')
+    if post.is_visible:
+        _decrement(post.author_id, 'published_posts_count')
+
+
+def post_visibility_changed(post):
+    if post.is_visible:
+        _increment(post.author_id, 'published_posts_count')
+    else:
+        _decrement(post.author_id, 'published_posts_count')
+
+
+def comment_added(comment):
+    _increment(
+        comment.author_id, 'comments_count', activity=comment.created_at
+    )
+
+
+def comment_removed(comment):
+    _decrement(comment.author_id, 'comments_count')
+
+
+def follower_added(follow):
+    _increment(follow.author_id, 'followers_count')
+
+
+def follower_removed(follow):
+    _decrement(follow.author_id, 'followers_count')
+
+
+def _category_added(category_id, pub_date):
+    rows = CategoryStats.objects.filter(category_id=category_id)
+    if rows.filter(posts_count=0).update(posts_count=1, last_post_at=pub_date):
+        # Категория появляется в навигации.
+        invalidate_nav()
+    elif not rows.update(
+        posts_count=F('posts_count') + 1,
+        last_post_at=Greatest(Coalesce('last_post_at', pub_date), pub_date)
+    ):
+        refresh_categories([category_id])
+
+
+def _category_removed(category_id, pub_date):
+    rows = CategoryStats.objects.filter(category_id=category_id)
+    if rows.filter(posts_count=1).update(posts_count=0, last_post_at=None):
+        invalidate_nav()
+        return
+    rows.filter(posts_count__gt=0).update(posts_count=F('posts_count') - 1)
+    # Дату пересчитываем, только если скрыт самый свежий пост.
+    rows.filter(last_post_at__lte=pub_date).update(
+        last_post_at=Subquery(
+            Post.objects.published()
+            .filter(category_id=OuterRef('category_id'))
+            .order_by('-pub_date').values('pub_date')[:1]
+        )
+    )
+
+
+def post_category_changed(previous, current):
+    """Счётчики категорий при смене видимости, категории или даты поста.
+
+    ``previous`` и ``current`` — пары (категория, дата) видимого поста
+    или ``None``. Навигация сбрасывается, только когда категория в ней
+    появляется или исчезает; число постов в ней обновится по истечении
+    NAV_CACHE_TIMEOUT.
+    """
+    if previous == current:
+        return
+    if previous is not None and previous[0] is not None:
+        _category_removed(*previous)
+    if current is not None and current[0] is not None:
+        _category_added(*current)
+
+
+def _aggregate(queryset, user_ids):
+    return {
+        row['author_id']: row
+        for row in queryset.filter(author_id__in=user_ids)
+        .order_by().values('author_id')
+        .annotate(count=Count('pk'), last=Max('created_at'))
+    }
+
+
+def refresh_authors(user_ids):
+    """Пересчитывает статистику указанных авторов по исходным таблицам."""
+    user_ids = list(user_ids)
+    for start in range(0, len(user_ids), REFRESH_BATCH_SIZE):
+        batch = user_ids[start:start + REFRESH_BATCH_SIZE]
+        posts = _aggregate(Post.objects.all(), batch)
+        published = _aggregate(Post.objects.published(), batch)
+        comments = _aggregate(Comment.objects.all(), batch)
+        followers = _aggregate(Follow.objects.all(), batch)
+        rows = []
+        for user_id in batch:
+            post_row = posts.get(user_id, {'count': 0, 'last': None})
+            comment_row = comments.get(user_id, {'count': 0, 'last': None})
+            activity = [
+                moment for moment in (post_row['last'], comment_row['last'])
+                if moment is not None
+            ]
+            rows.append(AuthorStats(
+                user_id=user_id,
+                posts_count=post_row['count'],
+                published_posts_count=published.get(
+                    user_id, {'count': 0}
+                )['count'],
+                comments_count=comment_row['count'],
+                last_activity=max(activity, default=None),
+                followers_count=followers.get(user_id, {'count': 0})['count'],
+            ))
+        _replace(AuthorStats, 'user_id', batch, rows)
+
+
+def _replace(model, key, batch, rows):
+    try:
+        with transaction.atomic():
+            model.objects.filter(**{f'{key}__in': batch}).delete()
+            model.objects.bulk_create(rows)
+    except IntegrityError:
+        # Параллельный пересчёт успел создать строки раньше нас.
+        pass
+
+
+def for_author(user):
+    """Статистика автора; при первом обращении она рассчитывается."""
+    try:
+        return AuthorStats.objects.get(user=user)
+    except AuthorStats.DoesNotExist:
+        refresh_authors([user.pk])
+        return AuthorStats.objects.filter(user=user).first()
+
+
+def refresh_categories(category_ids=None):
+    """Пересчитывает статистику категорий; без аргумента — всех.
+
+    Используется командой refresh_stats и пакетными изменениями; одиночные
+    сохранения меняют счётчики через ``post_category_changed()``.
+    """
+    if category_ids is None:
+        category_ids = Category.objects.values_list('pk', flat=True)
+    category_ids = list(category_ids)
+    for start in range(0, len(category_ids), REFRESH_BATCH_SIZE):
+        batch = category_ids[start:start + REFRESH_BATCH_SIZE]
+        published = {
+            row['category_id']: row
+            for row in Post.objects.published()
+            .filter(category_id__in=batch)
+            .order_by().values('category_id')
+            .annotate(count=Count('pk'), last=Max('pub_date'))
+        }
+        rows = [
+            CategoryStats(
+                category_id=category_id,
+                posts_count=published.get(category_id, {}).get('count', 0),
+                last_post_at=published.get(category_id, {}).get('last'),
+            )
+            for category_id in batch
+        ]
+        _replace(CategoryStats, 'category_id', batch, rows)
+    invalidate_nav()
+
+
+def invalidate_nav():
+    """Сбрасывает навигацию во всех процессах.
+
+    Сам список лежит в локальном кэше, а его версия — в общем, поэтому
+    скрытая категория пропадает из навигации всех процессов сразу.
+    """
+    bump_version(NAV_VERSION_KEY)
+
+
+def nav_categories():
+    """Опубликованные категории с постами для навигации."""
+    key = NAV_CACHE_KEY.format(version(NAV_VERSION_KEY))
+    categories = cache.get(key)
+    if categories is None:
+        categories = [
+            {
+                'title': row.category.title,
+                'slug': row.category.slug,
+                'posts_count': row.posts_count,
+                'last_post_at': row.last_post_at,
+            }
+            for row in CategoryStats.objects
+            .filter(category__is_published=True, posts_count__gt=0)
+            .select_related('category')
+            .order_by('category__title')
+        ]
+        cache.set(key, categories, NAV_CACHE_TIMEOUT)
+    return categories
@@ -0,0 +1,48 @@
+"""Потоковая отдача длинных страниц.
+
+Страница рендерится без списка элементов: на его месте выводится
+маркер. Всё до маркера отправляется клиенту сразу, затем элементы
+рендерятся пачками по мере чтения из базы, в конце отправляется
+остаток страницы. Объём памяти не зависит от длины списка.
+"""
+from django.http import StreamingHttpResponse
+from django.template.context import make_context
+from django.template.loader import get_template, render_to_string
+from django.utils.safestring import mark_safe
+
+STREAM_MARKER = '<!--blog:stream-->'
+ITEMS_PER_CHUNK = 20
+
+
+def stream_render(request, template_name, context, items, item_template,
+                  item_name):
+    """Потоковый ответ со страницей и элементами ``items``.
+
+    Шаблон страницы выводит ``{{ stream_marker }}`` вместо цикла по
+    элементам; каждый элемент рендерится шаблоном ``item_template``
+    с переменной ``item_name``.
+    """
+    page = render_to_string(
+        template_name,
+        {**context, 'stream_marker': mark_safe(STREAM_MARKER)},
+        request
+    )
+    head, tail = page.split(STREAM_MARKER, 1)
+    template = get_template(item_template).template
+
+    def generate():
+        yield head
+        item_context = make_context(context, request)
+        # Контекст-процессоры выполняются один раз на весь список.
+        with item_context.bind_template(template):
+            chunk = []
+            for item in items:
+                with item_context.push({item_name: item}):
+                    chunk.append(template.render(item_context))
+                if len(chunk) == ITEMS_PER_CHUNK:
+                    yield ''.join(chunk)
+                    chunk = []
+            yield ''.join(chunk)
+        yield tail
+
+    return StreamingHttpResponse(generate())
@@ -0,0 +1,167 @@
+"""Лента подписок с гибридной доставкой.
+
+Посты обычных авторов при публикации раскладываются по лентам
+подписчиков (``TimelineEntry``), и чтение сводится к диапазону по
+индексу ``(user, pub_date)``. Авторов, у которых подписчиков больше
+BLOG_FANOUT_FOLLOWER_LIMIT, раскладывать слишком дорого: их посты
+читаются из ``FeedEntry`` по индексу ``(author, pub_date)`` и
+сливаются с доставленными при чтении страницы.
+"""
+import heapq
+
+from django.conf import settings
+from django.db import transaction
+
+from . import feed
+from .models import AuthorStats, FeedEntry, Follow, Post, TimelineEntry
+
+FANOUT_BATCH_SIZE = 1000
+BACKFILL_POSTS = 200
+
+
+def _pushed_authors(author_ids):
+    """Авторы из списка, чьи посты раскладываются по лентам."""
+    popular = set(
+        AuthorStats.objects.filter(
+            user_id__in=author_ids,
+            followers_count__gt=settings.BLOG_FANOUT_FOLLOWER_LIMIT
+        ).values_list('user_id', flat=True)
+    )
+    return set(author_ids) - popular
+
+
+def _fan_out(post_id, author_id, pub_date):
+    followers = (
+        Follow.objects.filter(author_id=author_id)
+        .order_by('pk').values_list('follower_id', flat=True)
+        .iterator(chunk_size=FANOUT_BATCH_SIZE)
+    )
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(
+                user_id=follower_id, post_id=post_id,
+                author_id=author_id, pub_date=pub_date
+            )
+            for follower_id in followers
+        ),
+        batch_size=FANOUT_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def sync(post_ids):
+    """Доставляет видимые публикации подписчикам и убирает скрытые."""
+    rows = list(
+        Post.objects.filter(pk__in=list(post_ids))
+        .values_list('pk', 'author_id', 'pub_date', 'is_visible')
+    )
+    hidden = [pk for pk, _, _, is_visible in rows if not is_visible]
+    if hidden:
+        TimelineEntry.objects.filter(post_id__in=hidden).delete()
+    visible = [row for row in rows if row[3]]
+    pushed = _pushed_authors({row[1] for row in visible})
+    for post_id, author_id, pub_date, _ in visible:
+        with transaction.atomic():
+            TimelineEntry.objects.filter(post_id=post_id).exclude(
+                pub_date=pub_date
+            ).update(pub_date=pub_date)
+            if author_id in pushed:
+                _fan_out(post_id, author_id, pub_date)
+
+
+def _backfill(author_id, follower_ids):
+    """Доставляет подписчикам последние BACKFILL_POSTS постов автора."""
+    recent = list(
+        FeedEntry.objects.filter(author_id=author_id)
+        .values_list('post_id', 'pub_date')[:BACKFILL_POSTS]
+    )
+    if not recent:
+        return
+    TimelineEntry.objects.bulk_create(
+        (
+            TimelineEntry(
+                user_id=follower_id, post_id=post_id,
+                author_id=author_id, pub_date=pub_date
+            )
+            for follower_id in follower_ids
+            for post_id, pub_date in recent
+        ),
+        batch_size=FANOUT_BATCH_SIZE,
+        ignore_conflicts=True
+    )
+
+
+def follow(user, author):
+    """Подписывает на автора и доставляет его последние посты."""
+    _, created = Follow.objects.get_or_create(follower=user, author=author)
+    if created and author.pk in _pushed_authors([author.pk]):
+        _backfill(author.pk, [user.pk])
+
+
+def follower_removed(author_id):
+    """Возвращает раскладку постов автору, ставшему непопулярным.
+
+    Срабатывает, когда подписчиков становится ровно
+    BLOG_FANOUT_FOLLOWER_LIMIT. Пока автор был популярным, его посты
+    не раскладывались, а теперь перестают подмешиваться при чтении;
+    чтобы они не пропали из лент, последние посты доставляются всем
+    подписчикам.
+    """
+    if not AuthorStats.objects.filter(
+        user_id=author_id,
+        followers_count=settings.BLOG_FANOUT_FOLLOWER_LIMIT
+    ).exists():
+        return
+    _backfill(
+        author_id,
+        Follow.objects.filter(author_id=author_id)
+        .values_list('follower_id', flat=True)
+        .iterator(chunk_size=FANOUT_BATCH_SIZE)
+    )
+
+
+def unfollow(user, author):
+    for subscription in Follow.objects.filter(follower=user, author=author):
+        subscription.delete()
+    TimelineEntry.objects.filter(user=user, author=author).delete()
+
+
+class Timeline:
+    """Последовательность публикаций ленты подписок для ``Paginator``.
+
+    Срез сливает доставленные записи с постами популярных авторов и
+    возвращает экземпляры ``Post``, собранные из ``FeedEntry``.
+    """
+
+    def __init__(self, user):
+        self.popular = list(
+            AuthorStats.objects.filter(
+                user__followers__follower=user,
+                followers_count__gt=settings.BLOG_FANOUT_FOLLOWER_LIMIT
+            ).values_list('user_id', flat=True)
+        )
+        self.pushed = (
+            TimelineEntry.objects.filter(user=user)
+            .exclude(author_id__in=self.popular)
+        )
+        self.pulled = FeedEntry.objects.filter(author_id__in=self.popular)
+
+    def count(self):
+        return self.pushed.count() + (
+            self.pulled.count() if self.popular else 0
+        )
+
+    def __getitem__(self, page):
+        sources = [
+            self.pushed.values_list('pub_date', 'post_id')[:page.stop]
+        ]
+        if self.popular:
+            sources.append(
+                self.pulled.values_list('pub_date', 'post_id')[:page.stop]
+            )
+        keys = list(heapq.merge(*map(list, sources), reverse=True))
+        post_ids = [post_id for _, post_id in keys[page.start:page.stop]]
+        entries = FeedEntry.objects.in_bulk(post_ids)
+        return feed.as_posts(
+            entries[post_id] for post_id in post_ids if post_id in entries
+        )
@@ -1,15 +1,24 @@
-from django.urls import path
+from django.conf import settings
+from django.urls import path, re_path
 
-from .views import (add_comment, category_posts, create_post, delete_comment,
-                    delete_post, edit_comment, edit_post, edit_profile, index,
-                    post_detail, profile)
+from . import api, async_views, views
+from .views import (add_comment, create_post, delete_comment, delete_post,
+                    edit_comment, edit_post, edit_profile, follow_index,
+                    profile_follow, profile_unfollow, sitemap)
+
+# Под ASGI страницы чтения можно обслуживать асинхронными вариантами.
+read_views = async_views if settings.BLOG_ASYNC_VIEWS else views
 
 app_name = 'blog'
 
 urlpatterns = [
-    path('', index, name='index'),
+    path('', read_views.index, name='index'),
     path('posts/create/', create_post, name='create_post'),
-    path('posts/<int:post_id>/', post_detail, name='post_detail'),
+    path(
+        'posts/<int:post_id>/',
+        read_views.post_detail,
+        name='post_detail'
+    ),
     path('posts/<int:post_id>/edit/', edit_post, name='edit_post'),
     path('posts/<int:post_id>/delete/', delete_post, name='delete_post'),
     path('posts/<int:post_id>/comment/', add_comment, name='add_comment'),
@@ -25,9 +34,34 @@ urlpatterns = [
     ),
     path(
         'category/<slug:category_slug>/',
-        category_posts,
+        read_views.category_posts,
         name='category_posts'
     ),
+    path('feed/', follow_index, name='follow_index'),
     path('profile/edit/', edit_profile, name='edit_profile'),
-    path('profile/<str:username>/', profile, name='profile'),
+    path(
+        'profile/<str:username>/follow/',
+        profile_follow,
+        name='profile_follow'
+    ),
+    path(
+        'profile/<str:username>/unfollow/',
+        profile_unfollow,
+        name='profile_unfollow'
+    ),
+    path('profile/<str:username>/', read_views.profile, name='profile'),
+    path('sitemap.xml', sitemap, name='sitemap_index'),
+    re_path(
+        r'^sitemaps/(?P<filename>sitemap-[a-z]+-\d+\.xml\.gz)$',
+        sitemap,
+        name='sitemap_section'
+    ),
+    path('api/posts/', api.index, name='api_index'),
+    path('api/posts/<int:post_id>/', api.post_detail, name='api_post_detail'),
+    path(
+        'api/category/<slug:category_slug>/',
+        api.category_posts,
+        name='api_category_posts'
+    ),
+    path('api/profile/<str:username>/', api.profile, name='api_profile'),
 ]
@@ -1,57 +1,108 @@
+import os
+
+from django.conf import settings
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.models import User
 from django.core.paginator import Paginator
+from django.http import FileResponse, Http404
 from django.shortcuts import get_object_or_404, redirect, render
 
+from . import coalescing, feed, stats, timeline
 from .forms import CommentForm, PostForm, ProfileEditForm
-from .models import Category, Comment, Post
+from .models import Comment, FeedEntry, Follow, Post
+from .ratelimit import ratelimit
+from .registry import registry
+from .streaming import stream_render
 
 POSTS_PER_PAGE = 10
+PAGE_LINKS_ON_EACH_SIDE = 2
+PAGE_LINKS_ON_ENDS = 1
 
 
 def paginate(queryset, request):
-    return Paginator(
+    page_obj = Paginator(
         queryset, POSTS_PER_PAGE).get_page(request.GET.get('page'))
+    page_obj.page_links = list(page_obj.paginator.get_elided_page_range(
+        page_obj.number,
+        on_each_side=PAGE_LINKS_ON_EACH_SIDE,
+        on_ends=PAGE_LINKS_ON_ENDS
+    ))
+    return page_obj
+
+
+def render_feed(request, template_name, context):
+    if settings.BLOG_STREAM_FEEDS:
+        return stream_render(
+            request, template_name, context,
+            items=context['page_obj'],
+            item_template='includes/feed_item.html',
+            item_name='post'
+        )
+    return render(request, template_name, context)
+
+
+def index_context(request):
+    page_obj = paginate(FeedEntry.objects.all(), request)
+    page_obj.object_list = feed.as_posts(page_obj.object_list)
+    registry.attach(page_obj)
+    return {'page_obj': page_obj}
 
 
 def index(request):
-    posts = Post.objects.full_chain()
-    page_obj = paginate(posts, request)
-    return render(request, 'blog/index.html', {'page_obj': page_obj})
+    return render_feed(request, 'blog/index.html', index_context(request))
 
 
-def category_posts(request, category_slug):
-    category = get_object_or_404(
-        Category,
-        slug=category_slug,
-        is_published=True
-    )
-    posts = category.posts.full_chain()
+def category_context(request, category_slug):
+    category = registry.category_by_slug(category_slug)
+    if category is None or not category.is_published:
+        raise Http404
+    posts = Post.objects.category_feed(category)
 
     page_obj = paginate(posts, request)
-    return render(
+    registry.attach(page_obj)
+    return {'category': category, 'page_obj': page_obj}
+
+
+def category_posts(request, category_slug):
+    return render_feed(
         request,
         'blog/category.html',
-        {'category': category, 'page_obj': page_obj}
+        category_context(request, category_slug)
     )
 
 
-def post_detail(request, post_id):
-    post = get_object_or_404(Post, id=post_id)
+def post_detail_context(request, post_id):
+    posts = Post.objects.select_related('rendered')
+    post = get_object_or_404(posts, id=post_id)
 
     if request.user != post.author:
-        post = get_object_or_404(Post.objects.published(), id=post_id)
+        post = get_object_or_404(posts.published(), id=post_id)
+    registry.attach([post])
 
     form = CommentForm()
-    comments = post.comments.all()
+    comments = post.comments.select_related('author')
 
-    return render(request, 'blog/detail.html', {
+    return {
         'post': post,
         'form': form,
         'comments': comments,
-    })
+        'comment_count': comments.count(),
+    }
 
 
+def post_detail(request, post_id):
+    context = post_detail_context(request, post_id)
+    if context['comment_count'] > settings.BLOG_STREAM_COMMENTS_THRESHOLD:
+        return stream_render(
+            request, 'blog/detail.html', context,
+            items=context['comments'].iterator(),
+            item_template='includes/comment_item.html',
+            item_name='comment'
+        )
+    return render(request, 'blog/detail.html', context)
+
+
+@ratelimit('post')
 @login_required
 def create_post(request):
     form = PostForm(request.POST or None, files=request.FILES or None)
@@ -65,24 +116,57 @@ def create_post(request):
     return redirect('blog:profile', username=request.user.username)
 
 
-def profile(request, username):
+def profile_context(request, username):
     author = get_object_or_404(User, username=username)
 
     if request.user == author:
-        posts = (
-            author.posts
-            .with_relations()
-            .with_comment_count()
-        )
+        posts = author.posts.cards()
     else:
-        posts = author.posts.full_chain()
+        posts = author.posts.published().cards()
 
     page_obj = paginate(posts, request)
+    registry.attach(page_obj)
 
-    return render(request, 'blog/profile.html', {
+    return {
         'profile': author,
+        'stats': stats.for_author(author),
+        'is_following': (
+            request.user.is_authenticated
+            and Follow.objects.filter(
+                follower=request.user, author=author
+            ).exists()
+        ),
         'page_obj': page_obj,
-    })
+    }
+
+
+def profile(request, username):
+    return render_feed(
+        request, 'blog/profile.html', profile_context(request, username)
+    )
+
+
+@login_required
+def follow_index(request):
+    page_obj = paginate(timeline.Timeline(request.user), request)
+    registry.attach(page_obj)
+    return render_feed(request, 'blog/follow.html', {'page_obj': page_obj})
+
+
+@login_required
+def profile_follow(request, username):
+    author = get_object_or_404(User, username=username)
+    if request.method == 'POST' and author != request.user:
+        timeline.follow(request.user, author)
+    return redirect('blog:profile', username=username)
+
+
+@login_required
+def profile_unfollow(request, username):
+    author = get_object_or_404(User, username=username)
+    if request.method == 'POST':
+        timeline.unfollow(request.user, author)
+    return redirect('blog:profile', username=username)
 
 
 @login_required
@@ -118,14 +202,19 @@ def edit_post(request, post_id):
     return render(request, 'blog/create.html', {'form': form, 'is_edit': True})
 
 
+@ratelimit('comment')
 @login_required
 def add_comment(request, post_id):
     form = CommentForm(request.POST)
     if form.is_valid():
         comment = form.save(commit=False)
         comment.author = request.user
-        comment.post = get_object_or_404(Post, id=post_id)
-        comment.save()
+        if coalescing.enabled():
+            if not coalescing.add_comment(post_id, comment):
+                raise Http404
+        else:
+            comment.post = get_object_or_404(Post, id=post_id)
+            comment.save()
     return redirect('blog:post_detail', post_id=post_id)
 
 
@@ -169,3 +258,12 @@ def delete_post(request, post_id):
         'blog/create.html',
         {'post': post, 'form': None, 'is_delete': True}
     )
+
+
+def sitemap(request, filename='sitemap.xml'):
+    path = os.path.join(settings.SITEMAP_ROOT, filename)
+    if not os.path.isfile(path):
+        raise Http404
+    if filename.endswith('.gz'):
+        return FileResponse(open(path, 'rb'), content_type='application/gzip')
+    return FileResponse(open(path, 'rb'), content_type='application/xml')
@@ -10,6 +10,8 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
+import os
+from importlib.util import find_spec
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -70,6 +72,8 @@ TEMPLATES = [
                 'django.template.context_processors.request',
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
+                'blog.context_processors.categories',
+                'blog.context_processors.header',
             ],
         },
     },
@@ -111,6 +115,65 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Хэширование паролей: стоимость настраивается через окружение, хэши
+# с другими параметрами пересчитываются при входе. Argon2 выбирается
+# основным, если установлен пакет argon2-cffi.
+PASSWORD_HASHERS = [
+    'blog.hashers.TunablePBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+]
+if find_spec('argon2') is not None:
+    PASSWORD_HASHERS.insert(0, 'blog.hashers.TunableArgon2PasswordHasher')
+
+PASSWORD_PBKDF2_ITERATIONS = int(
+    os.environ.get('PASSWORD_PBKDF2_ITERATIONS', 260000)
+)
+PASSWORD_ARGON2_TIME_COST = int(os.environ.get('PASSWORD_ARGON2_TIME_COST', 2))
+PASSWORD_ARGON2_MEMORY_COST = int(
+    os.environ.get('PASSWORD_ARGON2_MEMORY_COST', 102400)
+)
+PASSWORD_ARGON2_PARALLELISM = int(
+    os.environ.get('PASSWORD_ARGON2_PARALLELISM', 8)
+)
+
+
+# Cache and sessions
+# https://docs.djangoproject.com/en/3.2/topics/cache/
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    # LocMem годится только для одного процесса: выход пользователя
+    # удаляет сессию лишь из кэша своего процесса, а остальные ещё
+    # SESSION_COOKIE_AGE считают её действующей. При нескольких
+    # процессах задайте общий бэкенд, например Redis или Memcached.
+    'sessions': {
+        'BACKEND': os.environ.get(
+            'SESSION_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('SESSION_CACHE_LOCATION', 'sessions'),
+    },
+    # Версии справочника категорий и шапок пользователей. Чтобы
+    # изменения были видны всем процессам, кэш должен быть общим.
+    'shared': {
+        'BACKEND': os.environ.get(
+            'BLOG_SHARED_CACHE_BACKEND',
+            'django.core.cache.backends.locmem.LocMemCache'
+        ),
+        'LOCATION': os.environ.get('BLOG_SHARED_CACHE_LOCATION', 'shared'),
+    },
+}
+
+# Сессии читаются из кэша и сохраняются в базе.
+SESSION_ENGINE = os.environ.get(
+    'SESSION_ENGINE', 'django.contrib.sessions.backends.cached_db'
+)
+SESSION_CACHE_ALIAS = 'sessions'
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -146,3 +209,47 @@ EMAIL_FILE_PATH = BASE_DIR / 'sent_emails'
 
 # AUTH_USER_MODEL = 'blog.User'
 LOGIN_URL = '/auth/login/'
+
+# Карты сайта строятся командой build_sitemaps и отдаются как файлы.
+SITE_URL = 'http://localhost:8000'
+SITEMAP_ROOT = BASE_DIR / 'sitemaps'
+SITEMAP_MAX_URLS = 50000
+
+# Асинхронные варианты страниц чтения для развёртывания под ASGI.
+BLOG_ASYNC_VIEWS = False
+
+# Потоковая отдача страниц: ленты целиком и публикации с большим
+# числом комментариев. Асинхронные варианты страниц не стримятся.
+BLOG_STREAM_FEEDS = False
+BLOG_STREAM_COMMENTS_THRESHOLD = 200
+
+# Время жизни закэшированной шапки сайта, секунды.
+BLOG_HEADER_CACHE_TIMEOUT = 600
+
+# Кэш, общий для всех процессов, и их число. При нескольких процессах
+# приложение не запустится, если этот кэш или кэш сессий — LocMem.
+BLOG_SHARED_CACHE = 'shared'
+BLOG_WORKERS = int(os.environ.get('WEB_CONCURRENCY', 1))
+
+# Справочник категорий перечитывается не реже, чем раз в столько
+# секунд, даже если изменение версии не дошло до процесса.
+BLOG_REGISTRY_MAX_AGE = 60
+
+# Лимиты на создание публикаций и комментариев: «число/период», где
+# период — s, m, h или d. Подряд проходит не больше «числа» запросов,
+# дальше — равномерно. Состояние хранится в указанном кэше; лимит
+# общий для всех процессов, только если кэш общий (не LocMem).
+BLOG_RATE_LIMITS = {
+    'post': '10/m',
+    'comment': '20/m',
+}
+BLOG_RATE_LIMIT_CACHE = 'default'
+
+# Окно объединения комментариев к одной публикации, миллисекунды;
+# 0 — каждый комментарий записывается сразу. При ненулевом окне ответ
+# на каждый комментарий задерживается до конца окна.
+BLOG_COMMENT_COALESCE_WINDOW = 0
+
+# Посты авторов, у которых подписчиков больше этого числа, не
+# раскладываются по лентам подписок, а подмешиваются при чтении.
+BLOG_FANOUT_FOLLOWER_LIMIT = 1000
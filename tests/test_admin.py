@@ -0,0 +1,164 @@
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from blog import moderation
+from blog.models import Comment, Post
+from blog.paginators import ApproximateCountPaginator
+from django.contrib.admin.models import DELETION, LogEntry
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
+from django.core.cache import cache
+from django.db import connection, models, router, transaction
+from django.test.client import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+CHANGELIST_URL = "/admin/blog/post/"
+
+
+def staff_client(mixer, *codenames):
+    staff = mixer.blend("auth.User", is_staff=True)
+    staff.user_permissions.set(
+        Permission.objects.filter(
+            content_type__app_label="blog", codename__in=codenames
+        )
+    )
+    client = Client()
+    client.force_login(staff)
+    return staff, client
+
+
+@pytest.fixture
+def hidden_post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1)
+    )
+
+
+def run_action(client, action, obj, **extra):
+    return client.post(
+        CHANGELIST_URL,
+        {"action": action, "_selected_action": [obj.pk], **extra},
+    )
+
+
+def test_view_only_staff_cannot_publish(mixer, hidden_post):
+    _, client = staff_client(mixer, "view_post")
+    run_action(client, "publish_posts", hidden_post)
+    hidden_post.refresh_from_db()
+    assert not hidden_post.is_published, (
+        "Убедитесь, что действие публикации в админке доступно только "
+        "пользователям с правом на изменение публикаций."
+    )
+
+    _, client = staff_client(mixer, "view_post", "change_post")
+    run_action(client, "publish_posts", hidden_post)
+    hidden_post.refresh_from_db()
+    assert hidden_post.is_published and hidden_post.is_visible
+
+
+def test_batch_delete_confirms_and_logs(mixer, hidden_post):
+    staff, client = staff_client(mixer, "view_post", "delete_post")
+
+    response = run_action(client, "delete_posts", hidden_post)
+    assert response.status_code == HTTPStatus.OK
+    assert Post.objects.filter(pk=hidden_post.pk).exists(), (
+        "Убедитесь, что пакетное удаление сначала показывает страницу "
+        "подтверждения."
+    )
+    assert 'name="post" value="yes"' in response.content.decode()
+
+    run_action(client, "delete_posts", hidden_post, post="yes")
+    assert not Post.objects.filter(pk=hidden_post.pk).exists()
+    assert LogEntry.objects.filter(
+        user=staff, object_id=str(hidden_post.pk), action_flag=DELETION,
+        object_repr=hidden_post.title,
+    ).exists(), (
+        "Убедитесь, что пакетное удаление записывается в журнал админки."
+    )
+
+
+def test_approximate_paginator_caches_count(
+        mixer, user, published_category):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+    )
+    cache.clear()
+    posts = Post.objects.order_by("pk")
+    assert ApproximateCountPaginator(posts, 2).count == 3
+    mixer.blend("blog.Post", author=user, category=published_category)
+    with CaptureQueriesContext(connection) as queries:
+        count = ApproximateCountPaginator(posts, 2).count
+    assert count == 3 and not queries.captured_queries, (
+        "Убедитесь, что точное число строк кэшируется и не считается "
+        "на каждый запрос."
+    )
+    assert ApproximateCountPaginator(posts.filter(
+        author=user
+    ), 2).count == 4, "Фильтрованный список должен считаться отдельно."
+
+
+def test_approximate_paginator_uses_estimate(
+        monkeypatch, mixer, user, published_category):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    monkeypatch.setattr(
+        ApproximateCountPaginator, "_estimate",
+        staticmethod(lambda queryset: 50000)
+    )
+    with CaptureQueriesContext(connection) as queries:
+        paginator = ApproximateCountPaginator(Post.objects.all(), 100)
+        assert paginator.count == 50000
+    assert not queries.captured_queries, (
+        "Убедитесь, что для больших таблиц используется оценка "
+        "планировщика вместо COUNT(*)."
+    )
+
+
+def test_post_changelist_skips_full_count(mixer, hidden_post):
+    admin_user = mixer.blend(
+        "auth.User", is_staff=True, is_superuser=True
+    )
+    client = Client()
+    client.force_login(admin_user)
+    response = client.get(CHANGELIST_URL)
+    assert response.status_code == HTTPStatus.OK
+    changelist = response.context["cl"]
+    assert isinstance(changelist.paginator, ApproximateCountPaginator), (
+        "Убедитесь, что список публикаций в админке использует "
+        "`ApproximateCountPaginator`."
+    )
+    assert changelist.show_full_result_count is False
+
+
+def test_batch_delete_cascades_recursively(
+        mixer, user, another_user, hidden_post):
+    comment = mixer.blend("blog.Comment", post=hidden_post, author=user)
+    other_post = mixer.blend("blog.Post", author=another_user)
+    with transaction.atomic():
+        moderation._delete_related(
+            get_user_model(), [user.pk], router.db_for_write(Post)
+        )
+    assert not Post.objects.filter(pk=hidden_post.pk).exists()
+    assert not Comment.objects.filter(pk=comment.pk).exists(), (
+        "Убедитесь, что пакетное удаление обходит каскад рекурсивно."
+    )
+    assert Post.objects.filter(pk=other_post.pk).exists()
+
+
+def test_batch_delete_refuses_unsupported_relations(
+        monkeypatch, mixer, user, hidden_post):
+    mixer.blend("blog.Comment", post=hidden_post, author=user)
+    monkeypatch.setattr(
+        Comment._meta.get_field("post").remote_field, "on_delete",
+        models.PROTECT
+    )
+    with pytest.raises(NotImplementedError):
+        moderation.delete_posts(Post.objects.filter(pk=hidden_post.pk))
+    assert Post.objects.filter(pk=hidden_post.pk).exists(), (
+        "Убедитесь, что при неподдерживаемой связи пакетное удаление "
+        "ничего не удаляет."
+    )
@@ -0,0 +1,94 @@
+import json
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def get_json(client, url, **params):
+    response = client.get(url, params)
+    body = b"".join(getattr(response, "streaming_content", [])) or (
+        response.content
+    )
+    return response.status_code, json.loads(body)
+
+
+@pytest.fixture
+def feed_posts(mixer, user, published_category):
+    now = timezone.now()
+    return mixer.cycle(5).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=mixer.sequence(
+            *(now - timedelta(hours=hours) for hours in (1, 2, 2, 3, 4))
+        ),
+    )
+
+
+def test_cursor_pages_continue_without_gaps(client, feed_posts):
+    seen = []
+    params = {"limit": 2, "fields": "id"}
+    for _ in range(len(feed_posts)):
+        status, page = get_json(client, "/api/posts/", **params)
+        assert status == HTTPStatus.OK
+        seen.extend(item["id"] for item in page["results"])
+        if page["next"] is None:
+            break
+        params["cursor"] = page["next"]
+
+    expected = [
+        post.pk for post in sorted(
+            feed_posts, key=lambda post: (post.pub_date, post.pk),
+            reverse=True
+        )
+    ]
+    assert seen == expected, (
+        "Убедитесь, что страницы API, полученные по курсору `next`, "
+        "идут подряд без пропусков и повторов, в том числе при "
+        "одинаковой дате публикации."
+    )
+
+
+def test_sparse_fields(client, feed_posts):
+    status, page = get_json(client, "/api/posts/", fields="id,title")
+    assert status == HTTPStatus.OK
+    assert all(set(item) == {"id", "title"} for item in page["results"]), (
+        "Убедитесь, что параметр `fields` ограничивает поля ответа API."
+    )
+
+
+@pytest.mark.parametrize(
+    "params",
+    [{"fields": "id,password"}, {"cursor": "not-a-cursor"}, {"limit": "x"}],
+)
+def test_bad_parameters_return_400(client, feed_posts, params):
+    status, body = get_json(client, "/api/posts/", **params)
+    assert status == HTTPStatus.BAD_REQUEST, (
+        "Убедитесь, что API отвечает статусом 400 на неизвестные поля, "
+        "некорректный курсор и нечисловой `limit`."
+    )
+    assert "error" in body
+
+
+def test_hidden_post_visible_only_to_author(
+        mixer, user, user_client, another_user_client, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1),
+    )
+    url = f"/api/posts/{post.pk}/"
+
+    status, _ = get_json(another_user_client, url)
+    assert status == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что снятая с публикации публикация недоступна "
+        "в API другим пользователям."
+    )
+    status, body = get_json(user_client, url, fields="id")
+    assert status == HTTPStatus.OK, (
+        "Убедитесь, что автор видит свою снятую с публикации публикацию "
+        "в API."
+    )
+    assert body["post"] == {"id": post.pk}
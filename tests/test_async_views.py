@@ -0,0 +1,70 @@
+import asyncio
+import re
+from datetime import timedelta
+
+import pytest
+from blog import async_views, views
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.sessions.backends.db import SessionStore
+from django.http import Http404
+from django.test import AsyncRequestFactory, RequestFactory
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="[^"]*"')
+
+
+def prepare(request):
+    request.user = AnonymousUser()
+    request.session = SessionStore()
+    return request
+
+
+def sync_html(view, path, *args):
+    return to_html(view(prepare(RequestFactory().get(path)), *args))
+
+
+def async_html(view, path, *args):
+    request = prepare(AsyncRequestFactory().get(path))
+    return to_html(asyncio.run(view(request, *args)))
+
+
+def to_html(response):
+    return CSRF_TOKEN.sub("", response.content.decode())
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    mixer.cycle(2).blend("blog.Comment", post=post, author=user)
+    return post
+
+
+def test_async_pages_match_sync(post):
+    pages = [
+        ("index", "/", ()),
+        ("category_posts", f"/category/{post.category.slug}/",
+         (post.category.slug,)),
+        ("profile", f"/profile/{post.author.username}/",
+         (post.author.username,)),
+        ("post_detail", f"/posts/{post.pk}/", (post.pk,)),
+    ]
+    for name, path, args in pages:
+        expected = sync_html(getattr(views, name), path, *args)
+        assert async_html(getattr(async_views, name), path, *args) == (
+            expected
+        ), (
+            f"Убедитесь, что асинхронный вариант страницы `{name}` "
+            "выводит тот же HTML, что и синхронный."
+        )
+
+
+def test_async_detail_hides_unpublished_post(post):
+    post.is_published = False
+    post.save()
+    with pytest.raises(Http404):
+        async_html(async_views.post_detail, f"/posts/{post.pk}/", post.pk)
@@ -0,0 +1,112 @@
+import threading
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from blog import coalescing
+from blog.models import Comment
+from django.db import connection
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db(transaction=True)]
+
+WINDOW = 200
+
+
+@pytest.fixture(autouse=True)
+def coalesce_window():
+    with override_settings(BLOG_COMMENT_COALESCE_WINDOW=WINDOW):
+        yield
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    return mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+
+
+def add_concurrently(post_id, author, count):
+    """Отправляет комментарии из нескольких потоков сразу."""
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def worker(number):
+        barrier.wait()
+        try:
+            results[number] = coalescing.add_comment(
+                post_id, Comment(author=author, text=f"Комментарий {number}")
+            )
+        except Exception as error:
+            results[number] = error
+        finally:
+            connection.close()
+
+    threads = [
+        threading.Thread(target=worker, args=(number,))
+        for number in range(count)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_concurrent_comments_share_one_batch(monkeypatch, user, post):
+    flush = coalescing._flush
+    batches = []
+
+    def counting_flush(post_id, comments):
+        batches.append(len(comments))
+        return flush(post_id, comments)
+
+    monkeypatch.setattr(coalescing, "_flush", counting_flush)
+    assert add_concurrently(post.pk, user, 3) == [True] * 3
+    assert batches == [3], (
+        "Убедитесь, что комментарии, пришедшие за окно объединения, "
+        "записываются одной пачкой."
+    )
+    assert post.comments.count() == 3
+
+
+def test_leader_error_reaches_followers(monkeypatch, user, post):
+    def failing_flush(post_id, comments):
+        raise RuntimeError("сбой записи")
+
+    monkeypatch.setattr(coalescing, "_flush", failing_flush)
+    results = add_concurrently(post.pk, user, 3)
+    assert all(isinstance(result, RuntimeError) for result in results), (
+        "Убедитесь, что ошибка записи пачки передаётся всем запросам, "
+        "ожидающим ведущего."
+    )
+    assert not coalescing._pending
+
+
+def test_follower_saves_alone_if_leader_stalls(monkeypatch, user, post):
+    monkeypatch.setattr(coalescing, "FLUSH_TIMEOUT_MARGIN", 0)
+    stalled = coalescing._pending[post.pk] = coalescing._Batch()
+    try:
+        comment = Comment(author=user, text="Не дождался")
+        assert coalescing.add_comment(post.pk, comment)
+    finally:
+        del coalescing._pending[post.pk]
+    assert stalled.comments == [], (
+        "Убедитесь, что комментарий, записанный без ведущего, не "
+        "остаётся в его пачке."
+    )
+    assert post.comments.filter(text="Не дождался").exists(), (
+        "Убедитесь, что без ответа ведущего комментарий записывается "
+        "напрямую."
+    )
+
+
+def test_comment_to_missing_post_returns_404(user_client):
+    response = user_client.post("/posts/999999/comment/", {"text": "Текст"})
+    assert response.status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что комментарий к несуществующей публикации при "
+        "объединении в пачки возвращает 404."
+    )
+    assert not Comment.objects.exists()
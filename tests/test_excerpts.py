@@ -0,0 +1,47 @@
+from datetime import timedelta
+
+import pytest
+from blog.excerpts import make_excerpt
+from django.template import Context, Template
+from django.utils import timezone
+
+TEXTS = [
+    "<script>alert(1)</script> и ещё несколько слов",
+    'Кавычки " и \' и амперсанд & в тексте',
+    "Первая строка\nвторая <b>строка</b>\r\nтретья",
+    " ".join(f"<i>слово{number}</i>" for number in range(15)),
+]
+
+
+@pytest.mark.parametrize("text", TEXTS)
+def test_excerpt_matches_template_filters(text):
+    expected = Template(
+        "{{ text|truncatewords:10|linebreaksbr }}"
+    ).render(Context({"text": text}))
+    assert make_excerpt(text) == expected, (
+        "Убедитесь, что анонс совпадает с выводом фильтров "
+        "`truncatewords:10|linebreaksbr` с автоэкранированием."
+    )
+
+
+def test_excerpt_escapes_html():
+    excerpt = make_excerpt('<img src=x onerror="alert(1)"> текст')
+    assert "<img" not in excerpt and "&lt;img" in excerpt, (
+        "Убедитесь, что HTML из текста публикации в анонсе экранируется."
+    )
+    assert '&quot;alert(1)&quot;' in excerpt
+
+
+@pytest.mark.django_db
+def test_feed_shows_escaped_excerpt(
+        mixer, client, user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        text="<script>alert(1)</script> анонс",
+    )
+    content = client.get("/").content.decode()
+    assert "<script>alert(1)</script>" not in content, (
+        "Убедитесь, что сохранённый анонс выводится в ленте экранированным."
+    )
+    assert "&lt;script&gt;alert(1)&lt;/script&gt; анонс" in content
@@ -0,0 +1,63 @@
+import csv
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+
+pytestmark = [pytest.mark.django_db]
+
+
+def export(tmp_path, name, **options):
+    output = tmp_path / name
+    call_command(
+        "export_data", "comments", output=str(output),
+        watermark_file=str(tmp_path / "watermark"),
+        stderr=io.StringIO(), **options
+    )
+    return output.read_text(encoding="utf-8")
+
+
+def test_watermark_exports_only_new_rows(
+        mixer, user, post_with_published_location, tmp_path):
+    first = mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location,
+        text="Первый",
+    )
+    rows = [json.loads(line) for line in export(tmp_path, "1.jsonl")
+            .splitlines()]
+    assert [row["id"] for row in rows] == [first.pk]
+    assert rows[0]["text"] == "Первый"
+    assert (tmp_path / "watermark").read_text() == (
+        first.created_at.isoformat()
+    ), "Убедитесь, что после выгрузки записывается отметка последней записи."
+
+    second = mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location,
+    )
+    rows = export(tmp_path, "2.jsonl").splitlines()
+    assert [json.loads(row)["id"] for row in rows] == [second.pk], (
+        "Убедитесь, что повторная выгрузка с отметкой содержит только "
+        "новые записи."
+    )
+
+    assert export(tmp_path, "3.jsonl") == ""
+    assert (tmp_path / "watermark").read_text() == (
+        second.created_at.isoformat()
+    ), "Пустая выгрузка не должна сдвигать отметку назад."
+
+
+def test_csv_export_has_header(
+        mixer, user, post_with_published_location, tmp_path):
+    comment = mixer.blend(
+        "blog.Comment", author=user, post=post_with_published_location,
+    )
+    output = tmp_path / "comments.csv"
+    call_command(
+        "export_data", "comments", format="csv", output=str(output),
+        stderr=io.StringIO()
+    )
+    header, row = list(csv.reader(output.open(encoding="utf-8")))
+    assert header == ["id", "post_id", "author_id", "text", "created_at"]
+    assert row[0] == str(comment.pk)
+    assert row[4] == comment.created_at.isoformat()
@@ -0,0 +1,86 @@
+import io
+from datetime import timedelta
+
+import pytest
+from blog import feed
+from blog.models import FeedEntry, Post
+from django.core.management import call_command
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def assert_consistent(step):
+    assert feed.check() == [], (
+        f"Убедитесь, что материализованная лента совпадает с "
+        f"`full_chain()` после шага: {step}."
+    )
+
+
+def test_feed_follows_post_category_and_author_changes(
+        mixer, user, published_category):
+    yesterday = timezone.now() - timedelta(days=1)
+    post, other = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=yesterday,
+    )
+    assert FeedEntry.objects.count() == 2
+    assert_consistent("создание публикаций")
+
+    post.title = "Новый заголовок"
+    post.text = "Новый текст"
+    post.save()
+    assert_consistent("редактирование публикации")
+
+    post.is_published = False
+    post.save()
+    assert not FeedEntry.objects.filter(post=post).exists()
+    assert_consistent("снятие публикации")
+
+    post.is_published = True
+    post.save()
+    other.delete()
+    assert_consistent("удаление публикации")
+
+    published_category.is_published = False
+    published_category.save()
+    assert not FeedEntry.objects.exists()
+    assert_consistent("снятие категории с публикации")
+
+    published_category.is_published = True
+    published_category.save()
+    assert_consistent("публикация категории")
+
+    user.username = "renamed"
+    user.save()
+    assert FeedEntry.objects.get(post=post).author_username == "renamed"
+    assert_consistent("переименование автора")
+
+
+def test_rebuild_restores_feed(mixer, user, published_category):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    FeedEntry.objects.all().delete()
+    assert len(feed.check()) == 3
+    assert feed.rebuild() == 3
+    assert_consistent("перестроение ленты")
+
+
+def test_backfilled_excerpts_reach_feed(mixer, user, published_category):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+        text="Текст <b>публикации</b>",
+    )
+    Post.objects.update(excerpt_html="")
+    FeedEntry.objects.update(excerpt_html="")
+    call_command(
+        "backfill_excerpts", "--missing", "--batch-size", "2",
+        stdout=io.StringIO()
+    )
+    assert set(FeedEntry.objects.values_list("excerpt_html", flat=True)) == {
+        "Текст &lt;b&gt;публикации&lt;/b&gt;"
+    }, "Убедитесь, что backfill_excerpts обновляет анонсы и в ленте."
+    assert_consistent("backfill_excerpts")
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+import pytest
+from blog.models import Post
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def test_category_feed_skips_category_join(mixer, user, published_category):
+    mixer.blend("blog.Post", author=user, category=published_category)
+    posts = Post.objects.category_feed(published_category)
+
+    sql = str(posts.query)
+    assert "blog_category" not in sql, (
+        "Убедитесь, что лента категории не соединяется с таблицей "
+        "категорий: публикация категории проверяется до запроса."
+    )
+    plan = posts.explain()
+    assert "blog_category" not in plan, (
+        "Убедитесь, что в плане запроса ленты категории нет обращения "
+        f"к таблице категорий. План запроса:\n{plan}"
+    )
+    assert "blog_category" in Post.objects.full_chain().explain(), (
+        "Полная цепочка `full_chain()` должна проверять публикацию "
+        "категории."
+    )
+
+
+def test_category_feed_filters_like_published(
+        mixer, user, published_category, another_category):
+    now = timezone.now()
+    yesterday = now - timedelta(days=1)
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=yesterday
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=yesterday
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=now + timedelta(days=1)
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=another_category,
+        pub_date=yesterday
+    )
+
+    assert list(Post.objects.category_feed(published_category)) == [post], (
+        "Убедитесь, что лента категории содержит только опубликованные "
+        "публикации этой категории."
+    )
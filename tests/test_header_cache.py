@@ -0,0 +1,65 @@
+from http import HTTPStatus
+
+import pytest
+from blog.caching import header_version
+from django.core.cache import cache
+
+pytestmark = [pytest.mark.django_db]
+
+PASSWORD = "Pa$$w0rd-header"
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
+@pytest.fixture
+def known_user(user):
+    user.set_password(PASSWORD)
+    user.save()
+    return user
+
+
+def header(client, url="/"):
+    content = client.get(url).content.decode()
+    return content[content.index("<header>"):content.index("</header>")]
+
+
+def test_header_follows_login_and_logout(client, known_user):
+    assert "Войти" in header(client)
+    version = header_version(known_user.pk)
+
+    response = client.post(
+        "/auth/login/",
+        {"username": known_user.username, "password": PASSWORD},
+    )
+    assert response.status_code == HTTPStatus.FOUND
+    logged_in = header(client)
+    assert known_user.username in logged_in and "Выйти" in logged_in, (
+        "Убедитесь, что после входа шапка не берётся из кэша анонимного "
+        "посетителя."
+    )
+    assert header_version(known_user.pk) == version, (
+        "Обновление `last_login` при входе не должно сбрасывать кэш шапки."
+    )
+
+    client.get("/auth/logout/")
+    logged_out = header(client)
+    assert "Войти" in logged_out and known_user.username not in logged_out, (
+        "Убедитесь, что после выхода шапка не берётся из кэша "
+        "авторизованного пользователя."
+    )
+
+
+def test_header_follows_username_change(user, user_client):
+    assert user.username in header(user_client)
+    old_username = user.username
+    user.username = f"{old_username}-renamed"
+    user.save()
+    renamed = header(user_client)
+    assert user.username in renamed, (
+        "Убедитесь, что изменение пользователя сбрасывает его "
+        "закэшированную шапку."
+    )
+    assert f"/profile/{old_username}/" not in renamed
@@ -0,0 +1,47 @@
+import pytest
+from blog import urls as blog_urls
+from blog.links import build_url
+from django.urls import converters, reverse
+from django.urls.resolvers import RoutePattern
+
+ARGS_BY_CONVERTER = {
+    converters.IntConverter: 42,
+    converters.SlugConverter: "some-slug_1",
+    converters.StringConverter: "user.name",
+}
+
+
+def patterns_with_converters():
+    # Маршруты на регулярных выражениях build_url не поддерживает.
+    for pattern in blog_urls.urlpatterns:
+        if not isinstance(pattern.pattern, RoutePattern):
+            continue
+        args = [
+            ARGS_BY_CONVERTER[type(converter)]
+            for converter in pattern.pattern.converters.values()
+        ]
+        yield pytest.param(
+            f"{blog_urls.app_name}:{pattern.name}", args, id=pattern.name
+        )
+
+
+@pytest.mark.parametrize("viewname, args", patterns_with_converters())
+def test_build_url_matches_reverse(viewname, args):
+    assert build_url(viewname, *args) == reverse(viewname, args=args), (
+        f"Убедитесь, что `build_url` строит для `{viewname}` тот же адрес, "
+        "что и `reverse`."
+    )
+
+
+@pytest.mark.parametrize(
+    "username",
+    ["Юзер", "user name", "50%", "a+b@c.d", "смайл😀", "?#&="],
+)
+def test_build_url_quotes_like_reverse(username):
+    for viewname in ("blog:profile", "blog:profile_follow", "blog:api_profile"):
+        assert build_url(viewname, username) == reverse(
+            viewname, args=[username]
+        ), (
+            "Убедитесь, что `build_url` экранирует имя пользователя так "
+            "же, как `reverse`."
+        )
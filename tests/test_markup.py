@@ -0,0 +1,99 @@
+import io
+from datetime import timedelta
+
+import pytest
+from blog.markup import MARKDOWN, render_markdown
+from blog.models import Post, PostRender
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "[клик](javascript:alert(1))",
+        "[клик](JavaScript:alert(1))",
+        "[клик](data:text/html,<script>alert(1)</script>)",
+    ],
+)
+def test_unsafe_links_are_not_rendered(text):
+    html = render_markdown(text)
+    assert "<a " not in html, (
+        "Убедитесь, что ссылки со схемами, кроме http(s), mailto и "
+        "относительных, не превращаются в теги `<a>`."
+    )
+
+
+def test_raw_html_is_escaped():
+    html = render_markdown('<script>alert(1)</script>\n<img src=x onerror=y>')
+    assert "<script" not in html and "<img" not in html, (
+        "Убедитесь, что HTML автора экранируется."
+    )
+    assert "&lt;script&gt;" in html
+
+
+def test_link_attribute_injection():
+    html = render_markdown('[x](https://a.org/"onmouseover="alert(1))')
+    assert 'href="https://a.org/&quot;onmouseover=&quot;alert(1"' in html, (
+        "Убедитесь, что кавычки в адресе ссылки экранируются и не "
+        "закрывают атрибут `href`."
+    )
+
+
+def test_emphasis_does_not_touch_urls_and_code():
+    html = render_markdown("[a *b*](https://x.org/*y*) и `*z*`")
+    assert 'href="https://x.org/*y*"' in html, (
+        "Убедитесь, что выделение не применяется внутри адреса ссылки."
+    )
+    assert "<em>b</em></a>" in html
+    assert "<code>*z*</code>" in html
+
+
+def test_fenced_code_is_literal():
+    html = render_markdown("```\n# не заголовок\n**x** <b>\n```\nтекст")
+    assert html == (
+        "<pre><code># не заголовок\n**x** &lt;b&gt;</code></pre>\n"
+        "<p>текст</p>"
+    )
+
+
+def test_nested_emphasis():
+    assert render_markdown("**полу *и* жирный**") == (
+        "<p><strong>полу <em>и</em> жирный</strong></p>"
+    )
+
+
+@pytest.mark.django_db
+def test_markdown_html_is_stored_on_save(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        text="**Первая** версия", text_format=MARKDOWN,
+        pub_date=timezone.now() - timedelta(days=1),
+    )
+    assert PostRender.objects.get(post=post).html == (
+        "<p><strong>Первая</strong> версия</p>"
+    ), "Убедитесь, что HTML Markdown-публикации сохраняется при save()."
+
+    Post.objects.filter(pk=post.pk).update(text="*Вторая* версия")
+    post = Post.objects.select_related("rendered").get(pk=post.pk)
+    with CaptureQueriesContext(connection) as queries:
+        html = post.text_html
+    assert not queries.captured_queries, (
+        "Убедитесь, что устаревший HTML строится в памяти без запросов "
+        "к базе."
+    )
+    assert html == "<p><em>Вторая</em> версия</p>", (
+        "Убедитесь, что HTML строится заново, если текст изменён "
+        "в обход save()."
+    )
+    assert PostRender.objects.get(post=post).html == (
+        "<p><strong>Первая</strong> версия</p>"
+    ), "Убедитесь, что чтение `text_html` не пишет в базу."
+
+    call_command("rebuild_renders", stdout=io.StringIO())
+    assert PostRender.objects.get(post=post).html == post.text_html, (
+        "Убедитесь, что команда `rebuild_renders` обновляет устаревший "
+        "HTML."
+    )
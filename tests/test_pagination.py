@@ -0,0 +1,44 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.core.paginator import Paginator
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+PAGE_LINK = re.compile(r'href="\?page=(\d+)"')
+
+
+@pytest.fixture
+def many_posts(mixer, user, published_category):
+    return mixer.cycle(101).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+
+
+def test_page_links_are_elided(client, user, many_posts):
+    response = client.get(f"/profile/{user.username}/", {"page": 6})
+    ellipsis = Paginator.ELLIPSIS
+    assert response.context["page_obj"].page_links == [
+        1, ellipsis, 4, 5, 6, 7, 8, ellipsis, 11
+    ], (
+        "Убедитесь, что в пагинаторе показываются крайние страницы, "
+        "по две соседних с текущей и многоточия вместо остальных."
+    )
+    content = response.content.decode()
+    assert set(map(int, PAGE_LINK.findall(content))) == {
+        1, 4, 5, 7, 8, 11
+    }, "Убедитесь, что ссылки ведут только на показанные страницы."
+    assert content.count(f'<span class="page-link">{ellipsis}</span>') == 2
+
+
+def test_pages_near_start_are_not_elided(client, user, many_posts):
+    response = client.get(f"/profile/{user.username}/", {"page": 4})
+    assert response.context["page_obj"].page_links == [
+        1, 2, 3, 4, 5, 6, Paginator.ELLIPSIS, 11
+    ], (
+        "Убедитесь, что у начала списка страницы показываются подряд, "
+        "а многоточие стоит только перед последней."
+    )
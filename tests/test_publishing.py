@@ -0,0 +1,167 @@
+from datetime import timedelta
+
+import pytest
+from blog.models import Post
+from blog.moderation import set_published
+from blog.publishing import Publisher
+from blog.signals import post_published
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+class FakeClock:
+    def __init__(self, now):
+        self.now = now
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += timedelta(seconds=seconds)
+
+
+@pytest.fixture
+def clock():
+    return FakeClock(timezone.now())
+
+
+@pytest.fixture
+def published_ids():
+    received = []
+
+    def receiver(sender, post_ids, **kwargs):
+        received.append(list(post_ids))
+
+    post_published.connect(receiver)
+    yield received
+    post_published.disconnect(receiver)
+
+
+def test_publisher_sleeps_until_due_posts(
+        mixer, user, published_category, clock, published_ids):
+    first, second = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=mixer.sequence(
+            clock.now + timedelta(minutes=10),
+            clock.now + timedelta(minutes=30),
+        ),
+    )
+    assert not Post.objects.published().exists(), (
+        "Убедитесь, что отложенные публикации не видны до наступления "
+        "даты публикации."
+    )
+    publisher = Publisher(clock=clock, sleep=clock.sleep, max_sleep=3600)
+
+    publisher.run(iterations=1)
+    assert clock.sleeps == [600], (
+        "Убедитесь, что публикатор спит до даты ближайшей отложенной "
+        "публикации."
+    )
+    assert not Post.objects.published().exists()
+
+    publisher.run(iterations=1)
+    assert list(Post.objects.published()) == [first]
+    assert published_ids == [[first.pk]], (
+        "Убедитесь, что при показе отложенной публикации отправляется "
+        "сигнал `post_published`."
+    )
+    assert clock.sleeps[-1] == 1200
+
+    publisher.run(iterations=2)
+    assert set(Post.objects.published()) == {first, second}
+    assert published_ids == [[first.pk], [second.pk]]
+    assert clock.sleeps[-1] == 3600, (
+        "Убедитесь, что без отложенных публикаций публикатор спит "
+        "не дольше `max_sleep`."
+    )
+
+
+def test_publisher_skips_hidden_categories(
+        mixer, user, clock, published_ids):
+    post = mixer.blend(
+        "blog.Post", author=user, category__is_published=False,
+        is_published=True, pub_date=clock.now + timedelta(minutes=1),
+    )
+    publisher = Publisher(clock=clock, sleep=clock.sleep)
+    publisher.run(iterations=2)
+    assert not Post.objects.published().exists()
+    assert published_ids == []
+
+    post.category.is_published = True
+    post.category.save()
+    publisher.run(iterations=1)
+    assert list(Post.objects.published()) == [post], (
+        "Убедитесь, что наступившая публикация показывается после "
+        "публикации её категории."
+    )
+    assert published_ids == [[post.pk]]
+
+
+def test_category_and_moderation_announce_published_posts(
+        mixer, user, published_category, published_ids):
+    yesterday = timezone.now() - timedelta(days=1)
+    hidden_category = mixer.blend("blog.Category", is_published=False)
+    in_category = mixer.blend(
+        "blog.Post", author=user, category=hidden_category,
+        is_published=True, pub_date=yesterday,
+    )
+    draft = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=yesterday,
+    )
+    assert published_ids == []
+
+    hidden_category.is_published = True
+    hidden_category.save()
+    assert published_ids == [[in_category.pk]], (
+        "Убедитесь, что при публикации категории отправляется сигнал "
+        "`post_published` с постами, ставшими видимыми."
+    )
+
+    set_published(Post.objects.filter(pk=draft.pk), True)
+    assert published_ids[-1] == [draft.pk], (
+        "Убедитесь, что пакетная публикация отправляет сигнал "
+        "`post_published`."
+    )
+    assert set(Post.objects.published()) == {in_category, draft}
+
+
+def test_visibility_accepts_string_pub_date(mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=1)
+    )
+    post.pub_date = "2000-01-01 12:00"
+    post.save()
+    post.refresh_from_db()
+    assert post.is_visible and post.pub_date.year == 2000, (
+        "Убедитесь, что дата публикации, заданная строкой, приводится "
+        "к datetime перед проверкой видимости."
+    )
+
+
+def test_save_reads_category_with_previous_row(
+        mixer, user, published_category):
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        pub_date=timezone.now() - timedelta(days=1)
+    )
+    post = Post.objects.get(pk=post.pk)
+    post.title = "Новый заголовок"
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    assert not any(
+        query["sql"].startswith("SELECT")
+        and 'FROM "blog_category"' in query["sql"]
+        for query in queries.captured_queries
+    ), (
+        "Убедитесь, что сохранение публикации не загружает категорию "
+        "отдельным запросом."
+    )
+    assert post.is_visible
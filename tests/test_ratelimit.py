@@ -0,0 +1,62 @@
+import time
+from http import HTTPStatus
+
+import pytest
+from blog.ratelimit import consume
+from django.core.cache import cache
+from django.test import override_settings
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+def test_consume_refills_bucket_evenly():
+    start = time.time()
+    assert [consume("key", "2/m", now=start + n) for n in range(2)] == [0, 0]
+    assert consume("key", "2/m", now=start + 15) == pytest.approx(15), (
+        "Убедитесь, что после исчерпания лимита `consume()` возвращает "
+        "время до появления следующего маркера."
+    )
+    assert consume("other", "2/m", now=start + 15) == 0, (
+        "Убедитесь, что вёдра разных ключей независимы."
+    )
+    assert consume("key", "2/m", now=start + 31) == 0, (
+        "Убедитесь, что маркеры восстанавливаются по одному за интервал "
+        "`период / лимит`."
+    )
+    assert consume("key", "2/m", now=start + 32) > 0
+
+
+def test_consume_has_no_burst_at_window_edges():
+    start = (time.time() // 60 + 1) * 60
+    allowed = [
+        consume("key", "2/m", now=start + offset) == 0
+        for offset in (-1, -0.5, 0, 0.5)
+    ]
+    assert allowed == [True, True, False, False], (
+        "Убедитесь, что на границе минутных окон не проходит двойной "
+        "лимит запросов."
+    )
+
+
+@override_settings(BLOG_RATE_LIMITS={"comment": "2/m"})
+def test_add_comment_returns_429(user_client, post_with_published_location):
+    url = f"/posts/{post_with_published_location.pk}/comment/"
+    for _ in range(2):
+        response = user_client.post(url, {"text": "Комментарий"})
+        assert response.status_code == HTTPStatus.FOUND
+    response = user_client.post(url, {"text": "Комментарий"})
+    assert response.status_code == HTTPStatus.TOO_MANY_REQUESTS, (
+        "Убедитесь, что при превышении лимита комментариев возвращается "
+        "статус 429."
+    )
+    assert 1 <= int(response["Retry-After"]) <= 61, (
+        "Убедитесь, что ответ 429 содержит заголовок `Retry-After`."
+    )
+    assert post_with_published_location.comments.count() == 2
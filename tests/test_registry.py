@@ -0,0 +1,36 @@
+import pytest
+from blog import registry as registry_module
+from blog.apps import check_shared_caches
+from blog.models import Category
+from blog.registry import registry
+from django.core.exceptions import ImproperlyConfigured
+from django.test import override_settings
+
+
+@pytest.mark.django_db
+def test_snapshot_expires_without_version_change(
+        monkeypatch, published_category):
+    now = [1000.0]
+    monkeypatch.setattr(registry_module.time, "monotonic", lambda: now[0])
+    registry.clear()
+    assert registry.category_by_slug(published_category.slug).is_published
+
+    # Изменение в другом процессе, версия до этого процесса не дошла.
+    Category.objects.filter(pk=published_category.pk).update(
+        is_published=False
+    )
+    assert registry.category_by_slug(published_category.slug).is_published
+
+    now[0] += 61
+    assert not registry.category_by_slug(
+        published_category.slug
+    ).is_published, (
+        "Убедитесь, что снимок справочника перечитывается не реже, чем "
+        "раз в `BLOG_REGISTRY_MAX_AGE` секунд."
+    )
+
+
+@override_settings(BLOG_WORKERS=4)
+def test_local_shared_cache_is_refused_for_several_workers():
+    with pytest.raises(ImproperlyConfigured):
+        check_shared_caches()
@@ -0,0 +1,86 @@
+import gzip
+import io
+import re
+from datetime import timedelta
+from http import HTTPStatus
+
+import pytest
+from blog import sitemaps
+from django.core.management import call_command
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture
+def sitemap_root(tmp_path):
+    with override_settings(SITEMAP_ROOT=tmp_path):
+        yield tmp_path
+
+
+def shard_urls(path):
+    with gzip.open(path, "rt", encoding="utf-8") as shard:
+        return re.findall(r"<loc>(.*?)</loc>", shard.read())
+
+
+def test_build_shards_only_visible_posts(
+        mixer, user, published_category, sitemap_root):
+    yesterday = timezone.now() - timedelta(days=1)
+    visible = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=yesterday,
+    )
+    hidden = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=yesterday,
+    )
+    call_command(
+        "build_sitemaps", base_url="https://blog.test", max_urls=2,
+        output=sitemap_root, stdout=io.StringIO(),
+    )
+
+    post_shards = sorted(sitemap_root.glob("sitemap-posts-*.xml.gz"))
+    assert [path.name for path in post_shards] == [
+        "sitemap-posts-1.xml.gz", "sitemap-posts-2.xml.gz"
+    ], "Убедитесь, что дочерние карты содержат не более `max_urls` адресов."
+    urls = [url for path in post_shards for url in shard_urls(path)]
+    assert urls == [
+        f"https://blog.test/posts/{post.pk}/" for post in visible
+    ], "Убедитесь, что в карту сайта попадают только видимые публикации."
+    assert f"/posts/{hidden.pk}/" not in "".join(urls)
+
+    index = (sitemap_root / sitemaps.INDEX_FILENAME).read_text()
+    for path in post_shards:
+        assert f"https://blog.test/sitemaps/{path.name}" in index
+
+
+def test_rebuild_removes_stale_shards(
+        mixer, user, published_category, sitemap_root):
+    mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    sitemaps.build(max_urls=1)
+    assert (sitemap_root / "sitemap-posts-3.xml.gz").exists()
+    sitemaps.build(max_urls=10)
+    assert not (sitemap_root / "sitemap-posts-3.xml.gz").exists(), (
+        "Убедитесь, что устаревшие шарды удаляются при перестроении."
+    )
+
+
+def test_sitemaps_are_served(client, published_category, sitemap_root):
+    sitemaps.build()
+    response = client.get("/sitemap.xml")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/xml"
+    assert b"<sitemapindex" in b"".join(response.streaming_content)
+
+    response = client.get("/sitemaps/sitemap-categories-1.xml.gz")
+    assert response.status_code == HTTPStatus.OK
+    assert response["Content-Type"] == "application/gzip"
+    assert client.get(
+        "/sitemaps/sitemap-posts-99.xml.gz"
+    ).status_code == HTTPStatus.NOT_FOUND, (
+        "Убедитесь, что для отсутствующей карты сайта возвращается 404."
+    )
@@ -0,0 +1,164 @@
+from datetime import timedelta
+
+import pytest
+from blog import stats
+from blog.models import AuthorStats, CategoryStats
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+def author_counts(user):
+    return AuthorStats.objects.values_list(
+        "posts_count", "published_posts_count"
+    ).get(user=user)
+
+
+def test_author_published_count_follows_visibility(
+        mixer, user, published_category):
+    yesterday = timezone.now() - timedelta(days=1)
+    visible = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=yesterday
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=yesterday
+    )
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() + timedelta(days=1)
+    )
+    assert author_counts(user) == (3, 1), (
+        "Убедитесь, что в статистике автора отдельно считаются все "
+        "публикации и только видимые в лентах."
+    )
+
+    visible.is_published = False
+    visible.save()
+    assert author_counts(user) == (3, 0)
+    visible.is_published = True
+    visible.save()
+    assert author_counts(user) == (3, 1)
+
+    published_category.is_published = False
+    published_category.save()
+    assert author_counts(user) == (3, 0), (
+        "Убедитесь, что снятие категории с публикации уменьшает число "
+        "опубликованных постов автора."
+    )
+    published_category.is_published = True
+    published_category.save()
+
+    visible.delete()
+    assert author_counts(user) == (2, 0)
+    stats.refresh_authors([user.pk])
+    assert author_counts(user) == (2, 0), (
+        "Счётчики, поддерживаемые сигналами, должны совпадать с полным "
+        "пересчётом."
+    )
+
+
+def test_profile_hides_unpublished_count_from_visitors(
+        mixer, user, user_client, another_user_client, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1)
+    )
+    url = f"/profile/{user.username}/"
+    assert "Публикаций: 0" in another_user_client.get(url).content.decode(), (
+        "Убедитесь, что посетители профиля видят только число "
+        "опубликованных постов автора."
+    )
+    assert "Публикаций: 1" in user_client.get(url).content.decode()
+
+
+def category_counts(category):
+    return CategoryStats.objects.values_list(
+        "posts_count", "last_post_at"
+    ).get(category=category)
+
+
+def test_category_counters_follow_single_saves(
+        mixer, user, published_category, another_category):
+    now = timezone.now()
+    older, newer = mixer.cycle(2).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True,
+        pub_date=mixer.sequence(now - timedelta(days=2),
+                                now - timedelta(days=1)),
+    )
+    assert category_counts(published_category) == (2, newer.pub_date), (
+        "Убедитесь, что новая публикация увеличивает счётчик категории "
+        "и сдвигает дату последней публикации."
+    )
+
+    newer.is_published = False
+    newer.save()
+    assert category_counts(published_category) == (1, older.pub_date), (
+        "Убедитесь, что после скрытия самой свежей публикации дата "
+        "последней публикации категории пересчитывается."
+    )
+
+    older.category = another_category
+    older.save()
+    assert category_counts(published_category) == (0, None)
+    assert category_counts(another_category) == (1, older.pub_date)
+
+    older.delete()
+    assert category_counts(another_category) == (0, None)
+
+    newer.is_published = True
+    newer.save()
+    expected = category_counts(published_category)
+    stats.refresh_categories([published_category.pk])
+    assert category_counts(published_category) == expected, (
+        "Счётчики категорий, поддерживаемые сигналами, должны совпадать "
+        "с полным пересчётом."
+    )
+
+
+def test_single_save_does_not_recount_category(
+        mixer, user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+    post = mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=False, pub_date=timezone.now() - timedelta(days=1)
+    )
+    post.is_published = True
+    with CaptureQueriesContext(connection) as queries:
+        post.save()
+    assert not any(
+        "COUNT(" in query["sql"] for query in queries.captured_queries
+    ), (
+        "Убедитесь, что сохранение одной публикации меняет счётчики "
+        "через F-выражения, а не пересчитывает их агрегатами."
+    )
+
+
+def test_hidden_category_leaves_nav_in_every_process(
+        mixer, user, published_category):
+    mixer.blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1)
+    )
+    assert [row["slug"] for row in stats.nav_categories()] == [
+        published_category.slug
+    ]
+    shared = caches[settings.BLOG_SHARED_CACHE]
+    before = shared.get(stats.NAV_VERSION_KEY)
+
+    published_category.is_published = False
+    published_category.save()
+    assert shared.get(stats.NAV_VERSION_KEY) != before, (
+        "Убедитесь, что версия навигации хранится в общем кэше "
+        "`BLOG_SHARED_CACHE` и меняется при скрытии категории."
+    )
+    assert stats.nav_categories() == []
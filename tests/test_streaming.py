@@ -0,0 +1,62 @@
+import re
+from datetime import timedelta
+
+import pytest
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+CSRF_TOKEN = re.compile(r'name="csrfmiddlewaretoken" value="[^"]*"')
+
+
+def body(response):
+    if response.streaming:
+        content = b"".join(response.streaming_content)
+    else:
+        content = response.content
+    # Разметка сравнивается без учёта пробелов между тегами.
+    html = CSRF_TOKEN.sub("", content.decode())
+    return re.sub(r">\s+<", "><", " ".join(html.split()))
+
+
+@pytest.fixture
+def post(mixer, user, published_category):
+    posts = mixer.cycle(3).blend(
+        "blog.Post", author=user, category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(days=1),
+    )
+    mixer.cycle(3).blend("blog.Comment", post=posts[0], author=user)
+    return posts[0]
+
+
+def fetch(client, url, **settings):
+    with override_settings(**settings):
+        return client.get(url)
+
+
+@pytest.mark.parametrize(
+    "url", ["/", "/category/{category}/", "/profile/{author}/"]
+)
+def test_streamed_feeds_match_buffered(user_client, post, url):
+    url = url.format(
+        category=post.category.slug, author=post.author.username
+    )
+    buffered = fetch(user_client, url, BLOG_STREAM_FEEDS=False)
+    streamed = fetch(user_client, url, BLOG_STREAM_FEEDS=True)
+    assert streamed.streaming and not buffered.streaming
+    assert body(streamed) == body(buffered), (
+        f"Убедитесь, что потоковая страница `{url}` совпадает "
+        "с обычной."
+    )
+
+
+def test_streamed_detail_matches_buffered(user_client, post):
+    url = f"/posts/{post.pk}/"
+    buffered = fetch(user_client, url, BLOG_STREAM_COMMENTS_THRESHOLD=100)
+    streamed = fetch(user_client, url, BLOG_STREAM_COMMENTS_THRESHOLD=1)
+    assert streamed.streaming and not buffered.streaming
+    assert body(streamed) == body(buffered), (
+        "Убедитесь, что публикация с потоковой отдачей комментариев "
+        "совпадает с обычной страницей."
+    )
@@ -0,0 +1,99 @@
+from datetime import timedelta
+
+import pytest
+from blog import timeline
+from blog.models import TimelineEntry
+from django.contrib.auth import get_user_model
+from django.core.paginator import Paginator
+from django.test import override_settings
+from django.utils import timezone
+
+pytestmark = [pytest.mark.django_db]
+
+
+@pytest.fixture(autouse=True)
+def fanout_limit():
+    with override_settings(BLOG_FANOUT_FOLLOWER_LIMIT=1):
+        yield
+
+
+@pytest.fixture
+def authors(mixer):
+    return mixer.cycle(2).blend(get_user_model())
+
+
+@pytest.fixture
+def posts(mixer, authors, published_category):
+    """Посты двух авторов вперемешку, от новых к старым."""
+    now = timezone.now()
+    return [
+        mixer.blend(
+            "blog.Post", author=authors[hours % 2],
+            category=published_category, is_published=True,
+            pub_date=now - timedelta(hours=hours),
+        )
+        for hours in range(1, 7)
+    ]
+
+
+def page_ids(user, number, per_page=4):
+    page = Paginator(timeline.Timeline(user), per_page).page(number)
+    return [post.pk for post in page.object_list]
+
+
+def test_pushed_and_pulled_authors_merge_in_order(
+        user, another_user, authors, posts):
+    pushed, popular = authors
+    timeline.follow(another_user, popular)
+    timeline.follow(user, pushed)
+    timeline.follow(user, popular)
+
+    assert set(
+        TimelineEntry.objects.filter(user=user)
+        .values_list("author_id", flat=True)
+    ) == {pushed.pk}, (
+        "Убедитесь, что посты популярного автора не раскладываются по "
+        "лентам подписчиков."
+    )
+    assert timeline.Timeline(user).count() == len(posts)
+    assert page_ids(user, 1) + page_ids(user, 2) == [
+        post.pk for post in posts
+    ], (
+        "Убедитесь, что лента подписок сливает доставленные и "
+        "подмешанные посты по дате без пропусков и повторов."
+    )
+
+
+def test_new_posts_reach_pushed_followers(
+        mixer, user, authors, published_category):
+    timeline.follow(user, authors[0])
+    post = mixer.blend(
+        "blog.Post", author=authors[0], category=published_category,
+        is_published=True, pub_date=timezone.now() - timedelta(minutes=1),
+    )
+    assert page_ids(user, 1) == [post.pk]
+
+
+def test_unfollow_removes_author_posts(user, authors, posts):
+    timeline.follow(user, authors[0])
+    timeline.follow(user, authors[1])
+    timeline.unfollow(user, authors[0])
+    assert page_ids(user, 1, per_page=10) == [
+        post.pk for post in posts if post.author == authors[1]
+    ], "Убедитесь, что после отписки посты автора пропадают из ленты."
+
+
+def test_author_dropping_below_limit_keeps_posts(
+        user, another_user, authors, posts):
+    popular = authors[1]
+    timeline.follow(another_user, popular)
+    timeline.follow(user, popular)
+    assert not TimelineEntry.objects.filter(user=user).exists()
+
+    timeline.unfollow(another_user, popular)
+    assert page_ids(user, 1, per_page=10) == [
+        post.pk for post in posts if post.author == popular
+    ], (
+        "Убедитесь, что посты автора, ставшего непопулярным, "
+        "доставляются подписчикам и не пропадают из ленты."
+    )